@@ -1,10 +1,13 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.shortcuts import render
 from django.utils.html import format_html
 
 from totalsum.admin import TotalsumAdmin
 
 from . import models
 from .utilities import format_iban
+from .forms import TransactionBulkEditForm
 
 
 @admin.register(models.UserProfile)
@@ -26,12 +29,36 @@ class UserProfileAdmin(admin.ModelAdmin):
 class TransactionInline(admin.TabularInline):
     model = models.Transaction
     extra = 0
-    fields = ["uuid", "account", "amount", "foreign_amount", "created", "modified"]
+    fields = ["uuid", "account", "amount", "foreign_amount", "date", "created", "modified"]
     readonly_fields = fields
 
 
 @admin.register(models.TransactionJournal)
 class TransactionJournalAdmin(admin.ModelAdmin):
+    def bulk_edit(self, request, queryset):
+        form = TransactionBulkEditForm(request.POST if "apply" in request.POST else None, prefix="edit")
+
+        if form.is_valid():
+            count = models.TransactionJournal.bulk_edit(queryset, form.get_changes())
+            self.message_user(request, "{count} transactions were updated.".format(count=count), messages.SUCCESS)
+
+            return None
+
+        return render(
+            request,
+            "admin/blackbook/transactionjournal/bulk_edit.html",
+            {
+                **self.admin_site.each_context(request),
+                "title": "Bulk edit transactions",
+                "opts": self.model._meta,
+                "queryset": queryset,
+                "form": form,
+                "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+            },
+        )
+
+    bulk_edit.short_description = "Change category, budget or date of the selected transactions"
+
     ordering = ["date"]
     date_hierarchy = "date"
     list_display = ["uuid", "short_description", "date", "amount", "type", "created", "modified"]
@@ -46,6 +73,7 @@ class TransactionJournalAdmin(admin.ModelAdmin):
     list_filter = ["type"]
     readonly_fields = ["uuid"]
     inlines = [TransactionInline]
+    actions = ["bulk_edit"]
 
 
 @admin.register(models.Account)
@@ -91,6 +119,48 @@ class CategoryAdmin(admin.ModelAdmin):
     readonly_fields = ["uuid"]
 
 
+@admin.register(models.CategorizationRule)
+class CategorizationRuleAdmin(admin.ModelAdmin):
+    ordering = ["priority", "name"]
+    list_display = ["name", "pattern", "min_amount", "max_amount", "account", "category", "budget", "priority", "active", "uuid"]
+    search_fields = ["name", "pattern", "uuid"]
+    list_filter = ["active"]
+    fieldsets = [
+        ["General information", {"fields": ["name", "priority", "active"]}],
+        ["Conditions", {"fields": ["pattern", "min_amount", "max_amount", "account"]}],
+        ["Actions", {"fields": ["category", "budget"]}],
+        ["Options", {"fields": ["uuid"]}],
+    ]
+    readonly_fields = ["uuid"]
+    raw_id_fields = ["account"]
+
+
+@admin.register(models.RecurringTransaction)
+class RecurringTransactionAdmin(admin.ModelAdmin):
+    ordering = ["next_due"]
+    date_hierarchy = "next_due"
+    list_display = ["short_description", "amount", "periodicity", "start_date", "end_date", "next_due", "active", "uuid"]
+    search_fields = ["short_description", "description", "uuid"]
+    list_filter = ["active", "periodicity"]
+    fieldsets = [
+        ["General information", {"fields": ["short_description", "description", "amount", "source_account", "destination_account"]}],
+        ["Schedule", {"fields": ["periodicity", "start_date", "end_date", "next_due"]}],
+        ["Options", {"fields": ["category", "budget", "active", "uuid"]}],
+    ]
+    readonly_fields = ["next_due", "uuid"]
+    raw_id_fields = ["source_account", "destination_account"]
+
+
+@admin.register(models.DuplicateCandidate)
+class DuplicateCandidateAdmin(admin.ModelAdmin):
+    ordering = ["-score"]
+    list_display = ["journal", "duplicate", "score", "days", "dismissed", "created", "uuid"]
+    search_fields = ["journal__short_description", "duplicate__short_description", "uuid"]
+    list_filter = ["dismissed"]
+    readonly_fields = ["score", "days", "uuid"]
+    raw_id_fields = ["journal", "duplicate"]
+
+
 class BudgetPeriodInline(admin.TabularInline):
     model = models.BudgetPeriod
     extra = 0
@@ -182,4 +252,4 @@ class BonusAdmin(TotalsumAdmin):
         ["General information", {"fields": ("created", "modified")}],
     ]
     totalsum_list = ["gross_amount", "net_amount", "taxes"]
-    unit_of_measure = "&euro;"
\ No newline at end of file
+    unit_of_measure = "&euro;"
@@ -0,0 +1,68 @@
+from django.core.cache import cache, caches, DEFAULT_CACHE_ALIAS
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.conf import settings
+
+import time
+
+
+def get_cache_key(name, *parts):
+    return ":".join(["blackbook", name] + [str(part) for part in parts])
+
+
+def is_shared_cache():
+    """Returns False when the cache lives in this process only (or caches nothing), then a bump made by another worker or
+    an import job is never seen here and cached values cannot be trusted."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def _new_generation():
+    return int(time.time() * 1000)
+
+
+def get_generation(name):
+    generation_key = get_cache_key(name, "generation")
+    generation = cache.get(generation_key)
+
+    if generation is None:
+        generation = _new_generation()
+        cache.add(generation_key, generation, timeout=None)
+        generation = cache.get(generation_key, generation)
+
+    return generation
+
+
+def bump_generation(name):
+    """Invalidates every value cached under ``name`` by moving its generation counter forward."""
+    generation_key = get_cache_key(name, "generation")
+
+    try:
+        cache.incr(generation_key)
+    except ValueError:
+        cache.set(generation_key, _new_generation(), timeout=None)
+
+
+def get_or_set(name, key_parts, default, timeout=None):
+    """Returns the value cached under ``name`` and ``key_parts`` for the current generation of ``name``.
+
+    The generation counter and the value are read in a single round trip, ``default`` is called to compute (and cache)
+    the value when it is missing or was stored for an older generation. Without a shared cache nothing is cached."""
+    if not is_shared_cache():
+        return default()
+
+    generation_key = get_cache_key(name, "generation")
+    key = get_cache_key(name, *key_parts)
+
+    values = cache.get_many([generation_key, key])
+    generation = values.get(generation_key, None)
+
+    if generation is None:
+        generation = get_generation(name)
+
+    if key in values and values[key][0] == generation:
+        return values[key][1]
+
+    value = default()
+    cache.set(key, (generation, value), timeout=timeout if timeout is not None else getattr(settings, "BLACKBOOK_CACHE_TIMEOUT", 86400))
+
+    return value
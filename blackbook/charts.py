@@ -1,10 +1,9 @@
-from django.db.models import Sum
+from django.db.models import BooleanField, Case, Count, Sum, Value, When
 
-from djmoney.money import Money
 from datetime import timedelta
 
+import numpy as np
 import json
-import re
 
 from .models import get_default_currency, TransactionJournal, Transaction, Account
 from .utilities import get_currency
@@ -96,44 +95,57 @@ class AccountChart(Chart):
 
         return options
 
-    def _generate_chart_data(self):
-        dates = []
+    def _generate_series(self, days):
+        """Returns the accounts to chart and a matrix holding their balance at the end of each day, one row per account.
 
-        for days_to_add in range(abs((self.end_date - self.start_date).days) + 1):
-            day = self.start_date + timedelta(days=days_to_add)
-            dates.append(day)
+        Daily deltas are binned per account in whole cents and accumulated on top of the opening balances, accounts are
+        ordered by their first transaction in the data followed by the requested accounts without transactions."""
+        deltas = list(self.data.filter(amount_currency=self.currency).exclude(account=None).values_list("account_id", "date", "amount"))
 
-        data = {"type": "line", "data": {"labels": [date.strftime("%d %b %Y") for date in dates], "datasets": []}}
+        account_ids = []
+        if len(deltas) > 0:
+            ids, first_occurrence = np.unique(np.fromiter((delta[0] for delta in deltas), dtype=np.int64, count=len(deltas)), return_index=True)
+            account_ids = ids[np.argsort(first_occurrence)].tolist()
+
+        account_ids += [account.id for account in self.accounts if account.id not in account_ids]
+        account_rows = {account_id: row for row, account_id in enumerate(account_ids)}
+
+        accounts = {
+            account.id: account for account in Account.objects.filter(id__in=account_ids).with_balances(as_of=self.start_date - timedelta(days=1))
+        }
+        accounts = [accounts[account_id] for account_id in account_ids]
+
+        rows = np.fromiter((account_rows[delta[0]] for delta in deltas), dtype=np.int64, count=len(deltas))
+        day_indexes = np.fromiter(((delta[1] - self.start_date).days for delta in deltas), dtype=np.int64, count=len(deltas))
+        amounts = np.fromiter((int(delta[2] * 100) for delta in deltas), dtype=np.int64, count=len(deltas))
 
-        accounts = {}
-        accounts_virtual_balance = {}
+        in_range = (day_indexes >= 0) & (day_indexes < days)
+        daily_deltas = np.zeros((len(accounts), days), dtype=np.int64)
+        np.add.at(daily_deltas, (rows[in_range], day_indexes[in_range]), amounts[in_range])
 
-        for item in self.data:
-            if str(item.amount.currency) == str(self.currency) and item.account is not None:
-                account_key = "{type} - {account}".format(type=item.account.get_type_display(), account=item.account.name)
+        opening_balances = np.fromiter(
+            (int((account.adjusted_balance - account.virtual_balance) * 100) for account in accounts), dtype=np.int64, count=len(accounts)
+        )
 
-                if account_key in accounts.keys():
-                    date_entry = accounts[account_key].get(item.journal.date, Money(0, self.currency))
-                    date_entry += item.amount
+        return accounts, np.round((opening_balances[:, np.newaxis] + np.cumsum(daily_deltas, axis=1)) / 100, 2)
 
-                    accounts[account_key][item.journal.date] = date_entry
+    def _generate_chart_data(self):
+        dates = []
 
-                else:
-                    accounts[account_key] = {item.journal.date: item.amount}
-                    accounts_virtual_balance[account_key] = item.account.virtual_balance
+        for days_to_add in range(abs((self.end_date - self.start_date).days) + 1):
+            day = self.start_date + timedelta(days=days_to_add)
+            dates.append(day)
 
-        for account in self.accounts:
-            account_key = "{type} - {account}".format(type=account.get_type_display(), account=account.name)
+        data = {"type": "line", "data": {"labels": [date.strftime("%d %b %Y") for date in dates], "datasets": []}}
 
-            if account_key not in accounts.keys():
-                accounts[account_key] = {}
+        accounts, balances = self._generate_series(days=len(dates))
 
         counter = 1
-        for account, date_entries in accounts.items():
+        for account, account_balances in zip(accounts, balances):
             color = get_color_code(counter)
 
             account_data = {
-                "label": account,
+                "label": "{type} - {account}".format(type=account.get_type_display(), account=account.name),
                 "fill": "!1",
                 "borderColor": "rgba({color}, 1.0)".format(color=color),
                 "borderWidth": 2,
@@ -154,40 +166,32 @@ class AccountChart(Chart):
 
             counter += 1
 
-            for date_index in range(len(dates)):
-                date = dates[date_index]
-
-                value = 0
+            account_data["data"] = account_balances.tolist()
+            data["data"]["datasets"].append(account_data)
 
-                if date_index == 0:
-                    ACCOUNT_REGEX = re.compile(r"(.*)\s-\s(.*)")
+        return data
 
-                    account_name = ACCOUNT_REGEX.match(account)[2]
-                    account_type = Account.AccountType.ASSET_ACCOUNT
 
-                    for type in Account.AccountType:
-                        if type.label == ACCOUNT_REGEX.match(account)[1]:
-                            account_type = type
+def get_income_label(journal_type, source_accounts):
+    if journal_type == TransactionJournal.TransactionType.START:
+        return "Starting balance"
 
-                    account_object = Account.objects.get(name=account_name, type=account_type)
-                    value = float(account_object.balance_until_date(date - timedelta(days=1)).amount) - float(account_object.virtual_balance)
-                else:
-                    value = account_data["data"][date_index - 1]
+    if source_accounts:
+        return ", ".join([account["account"] for account in source_accounts])
 
-                if date in date_entries.keys():
-                    value += float(date_entries[date].amount)
+    return "External account (untracked)"
 
-                account_data["data"].append(round(value, 2))
-            data["data"]["datasets"].append(account_data)
 
-        return data
+def sort_totals(totals):
+    return sorted(totals.items(), key=lambda item: (-abs(item[1]), item[0]))
 
 
 class TransactionChart(Chart):
-    def __init__(self, data, user=None, income=False, expenses_budget=False, expenses_category=False, *args, **kwargs):
+    def __init__(self, data, user=None, income=False, expenses_budget=False, expenses_category=False, totals=None, *args, **kwargs):
         self.income = income
         self.expenses_budget = expenses_budget
         self.expenses_category = expenses_category
+        self.totals = totals
         self.user = user
         self.currency = get_default_currency(user=self.user)
 
@@ -201,44 +205,41 @@ class TransactionChart(Chart):
 
         return options
 
-    def _generate_chart_data(self):
-        data = {"type": "pie", "data": {"labels": [], "datasets": [{"data": [], "borderWidth": [], "backgroundColor": [], "borderColor": []}]}}
+    def get_totals(self):
+        """Returns the (label, total) pairs of the slices, summed by the database per category, budget or source accounts.
 
-        amounts = {}
-        account_names = {}
+        When the chart was given precomputed ``totals`` (label to amount) those are used instead."""
+        if self.totals is not None:
+            return sort_totals(self.totals)
 
         if self.income:
-            self.data = [item for item in self.data if not item.amount.amount < 0]
+            transactions = self.data.filter(amount__gte=0)
+            group_by = ["journal__type", "journal__source_accounts"]
+        elif self.expenses_category:
+            transactions = self.data.filter(amount__lt=0, journal__category__isnull=False)
+            group_by = ["journal__category__name"]
+        elif self.expenses_budget:
+            transactions = self.data.filter(amount__lt=0, journal__budget__isnull=False)
+            group_by = ["journal__budget__budget__name"]
         else:
-            self.data = [item for item in self.data if item.amount.amount < 0]
-
-        for transaction in self.data:
-            account_name = "External account (untracked)"
+            return []
 
+        amounts = {}
+        for group in transactions.order_by().values(*group_by).annotate(total=Sum("amount")):
             if self.income:
-                if transaction.journal.type == TransactionJournal.TransactionType.START:
-                    account_name = "Starting balance"
-
-                else:
-                    if len(transaction.journal.source_accounts) > 0:
-                        account_name = ", ".join([account["account"] for account in transaction.journal.source_accounts])
-
+                account_name = get_income_label(group["journal__type"], group["journal__source_accounts"])
             else:
-                if self.expenses_budget and transaction.journal.budget is not None:
-                    account_name = transaction.journal.budget.budget.name
+                account_name = group[group_by[0]]
 
-                if self.expenses_category and transaction.journal.category is not None:
-                    account_name = transaction.journal.category.name
+            amounts[account_name] = amounts.get(account_name, 0.0) + float(group["total"])
 
-            amount = amounts.get(account_name, 0.0)
-            amount += float(transaction.amount.amount)
-            amounts[account_name] = amount
+        return sort_totals(amounts)
 
-        if not self.income:
-            amounts.pop("External account (untracked)", None)
+    def _generate_chart_data(self):
+        data = {"type": "pie", "data": {"labels": [], "datasets": [{"data": [], "borderWidth": [], "backgroundColor": [], "borderColor": []}]}}
 
         counter = 1
-        for account, amount in amounts.items():
+        for account, amount in self.get_totals():
             color = get_color_code(counter)
             counter += 1
 
@@ -248,4 +249,119 @@ class TransactionChart(Chart):
             data["data"]["datasets"][0]["backgroundColor"].append("rgba({color}, 1.0)".format(color=color))
             data["data"]["datasets"][0]["borderColor"].append("rgba(255, 255, 255, 1.0)".format(color=color))
 
-        return data
\ No newline at end of file
+        return data
+
+
+class ChartBundle:
+    """Builds the income, expenses by budget and expenses by category pie charts (and their transaction counts) of a
+    queryset of transactions from a single grouped query."""
+
+    def __init__(self, data, user=None, income_transfers=True):
+        self.data = data
+        self.user = user
+        self.income_transfers = income_transfers
+
+    def _get_groups(self):
+        return (
+            self.data.order_by()
+            .annotate(is_income=Case(When(amount__gte=0, then=Value(True)), default=Value(False), output_field=BooleanField()))
+            .values("is_income", "journal__type", "journal__source_accounts", "journal__category__name", "journal__budget__budget__name")
+            .annotate(total=Sum("amount"), count=Count("id"))
+        )
+
+    def generate_charts(self):
+        totals = {"income": {}, "expense_budget": {}, "expense_category": {}}
+        counts = {"income": 0, "expense_budget": 0, "expense_category": 0}
+
+        for group in self._get_groups():
+            slices = []
+
+            if group["is_income"]:
+                if self.income_transfers or group["journal__type"] != TransactionJournal.TransactionType.TRANSFER:
+                    slices.append(("income", get_income_label(group["journal__type"], group["journal__source_accounts"])))
+
+            else:
+                if group["journal__budget__budget__name"] is not None:
+                    slices.append(("expense_budget", group["journal__budget__budget__name"]))
+
+                if group["journal__category__name"] is not None:
+                    slices.append(("expense_category", group["journal__category__name"]))
+
+            for chart, label in slices:
+                totals[chart][label] = totals[chart].get(label, 0.0) + float(group["total"])
+                counts[chart] += group["count"]
+
+        charts = {}
+        for chart in totals.keys():
+            charts["{chart}_chart".format(chart=chart)] = TransactionChart(data=self.data, totals=totals[chart], user=self.user).generate_json()
+            charts["{chart}_chart_count".format(chart=chart)] = counts[chart]
+
+        return charts
+
+
+class NetWorthChart(Chart):
+    def __init__(self, data, start_date, end_date, user=None, *args, **kwargs):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.user = user
+        self.currency = get_default_currency(user=self.user)
+
+        super().__init__(data=data, *args, **kwargs)
+
+    def _generate_chart_options(self):
+        options = self._get_default_options()
+
+        options["tooltips"]["callbacks"] = {
+            "label": "<<function(tooltipItems, data) { return data.datasets[tooltipItems.datasetIndex].label + ': ' + tooltipItems.yLabel + ' (%s)'; }>>"
+            % get_currency(self.currency, self.user)
+        }
+
+        if abs((self.end_date - self.start_date).days) > 730:
+            options["scales"]["xAxes"][0]["time"]["unit"] = "month"
+        elif abs((self.end_date - self.start_date).days) > 150:
+            options["scales"]["xAxes"][0]["time"]["unit"] = "week"
+
+        return options
+
+    def _generate_chart_data(self):
+        days = abs((self.end_date - self.start_date).days) + 1
+        dates = [self.start_date + timedelta(days=days_to_add) for days_to_add in range(days)]
+
+        snapshots = self.data.filter(net_worth_currency=self.currency)
+        opening_balance = snapshots.filter(date__lt=self.start_date).order_by("-date").values_list("net_worth", flat=True).first()
+
+        net_worth = np.full(days, np.nan)
+        net_worth[0] = float(opening_balance) if opening_balance is not None else 0.0
+
+        for date, amount in snapshots.filter(date__range=(self.start_date, self.end_date)).values_list("date", "net_worth"):
+            net_worth[(date - self.start_date).days] = float(amount)
+
+        valid = np.where(np.isnan(net_worth), 0, np.arange(days))
+        net_worth = np.round(net_worth[np.maximum.accumulate(valid)], 2)
+
+        color = get_color_code(1)
+
+        return {
+            "type": "line",
+            "data": {
+                "labels": [date.strftime("%d %b %Y") for date in dates],
+                "datasets": [
+                    {
+                        "label": "Net worth",
+                        "fill": "!1",
+                        "borderColor": "rgba({color}, 1.0)".format(color=color),
+                        "borderWidth": 2,
+                        "borderDash": [],
+                        "borderDash0ffset": 0,
+                        "pointBackgroundColor": "rgba({color}, 1.0)".format(color=color),
+                        "pointBorderColor": "rgba(255,255,255,0)",
+                        "pointHoverBackgroundColor": "rgba({color}, 1.0)".format(color=color),
+                        "pointBorderWidth": 20,
+                        "pointHoverRadius": 4,
+                        "pointHoverBorderWidth": 15,
+                        "pointRadius": 0,
+                        "data": net_worth.tolist(),
+                    }
+                ],
+            },
+        }
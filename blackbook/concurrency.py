@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.db import connection, connections, OperationalError
+from django.db.models import Q
+
+from functools import wraps
+
+import logging
+import random
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE codes of PostgreSQL serialization failures and deadlocks, MySQL error numbers of deadlocks and lock wait timeouts
+CONFLICT_PGCODES = ["40001", "40P01"]
+CONFLICT_MYSQL_ERRORS = [1213, 1205]
+
+
+def is_conflict(error):
+    """Returns True when ``error`` is a deadlock, serialization failure or lock timeout that is worth retrying."""
+    cause = error.__cause__
+
+    if getattr(cause, "pgcode", None) in CONFLICT_PGCODES:
+        return True
+
+    if len(error.args) > 0 and error.args[0] in CONFLICT_MYSQL_ERRORS:
+        return True
+
+    return "database is locked" in str(error) or "deadlock" in str(error).lower()
+
+
+def retry_on_conflict(function=None, attempts=None, backoff=None, max_backoff=None):
+    """Retries ``function`` with exponential backoff (and jitter) when it fails on a lock conflict.
+
+    Only the outermost call retries: inside an atomic block the failed transaction has to be rolled back by its owner,
+    so the error is passed on. Defaults come from the BLACKBOOK_WRITE_RETRIES, BLACKBOOK_WRITE_BACKOFF and
+    BLACKBOOK_WRITE_MAX_BACKOFF settings."""
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            max_attempts = attempts or getattr(settings, "BLACKBOOK_WRITE_RETRIES", 5)
+            delay = backoff or getattr(settings, "BLACKBOOK_WRITE_BACKOFF", 0.05)
+            max_delay = max_backoff or getattr(settings, "BLACKBOOK_WRITE_MAX_BACKOFF", 1.0)
+
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return function(*args, **kwargs)
+
+                except OperationalError as error:
+                    if connection.in_atomic_block or attempt == max_attempts or not is_conflict(error):
+                        raise
+
+                    logger.info("Write conflict in %s (attempt %s of %s): %s", function.__qualname__, attempt, max_attempts, error)
+                    time.sleep(min(delay * 2 ** (attempt - 1), max_delay) * random.uniform(0.5, 1.0))
+
+        return wrapper
+
+    if function is not None:
+        return decorator(function)
+
+    return decorator
+
+
+def lock_rows(queryset):
+    """Locks the rows matched by ``queryset`` until the end of the current atomic block.
+
+    SQLite ignores FOR UPDATE, there the write lock on the whole database is taken instead. It should be the first statement
+    of the atomic block: without a read lock held SQLite waits for the lock (up to its timeout) instead of failing right away."""
+    if connections[queryset.db].vendor == "sqlite":
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute("UPDATE {table} SET id = id WHERE 0".format(table=queryset.model._meta.db_table))
+
+    return list(queryset.select_for_update().values_list("pk", flat=True))
+
+
+def lock_global(name, model):
+    """Serializes writers of a table shared by the whole ledger (like the net worth snapshots) until the end of the current
+    atomic block, whichever accounts they touch.
+
+    PostgreSQL takes a transaction level advisory lock on ``name``, SQLite the write lock on the whole database and other
+    databases lock the first row of ``model`` (to be taken last, after the account locks, to keep the lock order)."""
+    vendor = connections[model.objects.db].vendor
+
+    if vendor == "postgresql":
+        with connections[model.objects.db].cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [zlib.crc32("blackbook:{name}".format(name=name).encode())])
+
+    else:
+        lock_rows(model.objects.order_by("pk")[:1])
+
+
+def lock_accounts(accounts, journal=None):
+    """Locks ``accounts`` (instances or ids) and the accounts of the current legs of ``journal``, always in id order so that
+    concurrent writers touching the same accounts cannot deadlock each other."""
+    from .models import Account, Transaction
+
+    filters = Q(pk__in={account if isinstance(account, int) else account.pk for account in accounts if account is not None})
+    if journal is not None:
+        filters |= Q(pk__in=Transaction.objects.filter(journal=journal).values("account_id"))
+
+    return lock_rows(Account.objects.filter(filters).order_by("pk"))
@@ -1,22 +1,93 @@
+from django.db import transaction as db_transaction
+from django.db.models import F, Q
 from django.utils import timezone
 
-from .models import Budget, BudgetPeriod
+from .models import Budget, BudgetPeriod, RecurringTransaction, TransactionJournal
 from .utilities import calculate_period
+from .concurrency import lock_rows, retry_on_conflict
+from .rules import get_budget_period
+from .duplicates import find_duplicates as find_duplicate_transactions, save_duplicates
 
 
 def create_budget_periods():
     budgets = (
         Budget.objects.filter(active=True)
         .exclude(auto_budget=Budget.AutoBudget.NO)
-        .filter(budgetperiods__end_date__lt=timezone.localdate())
-        .exclude(budgetperiods__start_date__lte=timezone.localdate(), budgetperiods__end_date__gte=timezone.localdate())
+        .filter(periods__end_date__lt=timezone.localdate())
+        .exclude(periods__start_date__lte=timezone.localdate(), periods__end_date__gte=timezone.localdate())
+        .distinct()
     )
 
     for budget in budgets:
-        amount_to_add = budget.amount
+        with db_transaction.atomic():
+            # Lock the periods and check again, another run (or a save of the budget) may have added the period in the meantime
+            lock_rows(BudgetPeriod.objects.filter(budget=budget))
+            if budget.get_period_for_date(timezone.localdate()) is not None:
+                continue
 
-        if budget.auto_budget == Budget.AutoBudget.ADD:
-            amount_to_add += budget.budgetperiods.last().available
+            amount_to_add = budget.amount
 
-        period = calculate_period(periodicity=budget.auto_budget_period, start_date=timezone.localdate())
-        budget.budgetperiods.create(start_date=period["start_date"], end_date=period["end_date"], amount=amount_to_add)
+            if budget.auto_budget == Budget.AutoBudget.ADD:
+                amount_to_add += budget.periods.order_by("end_date").last().available
+
+            period = calculate_period(periodicity=budget.auto_budget_period, start_date=timezone.localdate())
+            budget.periods.create(start_date=period["start_date"], end_date=period["end_date"], amount=amount_to_add)
+
+
+@retry_on_conflict
+def create_recurring_transactions(date=None):
+    """Creates every occurrence of the recurring transactions due up to ``date`` (today by default), including the ones missed
+    while the job did not run, with a single ``TransactionJournal.bulk_create``. Occurrences that already exist are skipped, so
+    running the job again (or twice at the same time) creates nothing new. Returns the created journals."""
+    date = date if date is not None else timezone.localdate()
+    due = RecurringTransaction.objects.filter(active=True, next_due__lte=date).filter(Q(end_date=None) | Q(next_due__lte=F("end_date")))
+
+    with db_transaction.atomic():
+        recurring_ids = lock_rows(due)
+        if len(recurring_ids) == 0:
+            return []
+
+        recurring_transactions = list(
+            RecurringTransaction.objects.filter(id__in=recurring_ids).select_related("source_account", "destination_account", "category")
+        )
+        existing = set(
+            TransactionJournal.objects.filter(
+                recurring_id__in=recurring_ids, date__gte=min(recurring.next_due for recurring in recurring_transactions)
+            ).values_list("recurring_id", "date")
+        )
+
+        entries = []
+        budget_periods = {}
+        now = timezone.now()
+
+        for recurring in recurring_transactions:
+            due_dates = recurring.get_due_dates(until=date)
+
+            for due_date in due_dates:
+                if (recurring.id, due_date) in existing:
+                    continue
+
+                entry = recurring.get_transactions(date=due_date)
+                if recurring.budget_id is not None:
+                    entry["budget"] = get_budget_period(recurring.budget_id, due_date, budget_periods)
+
+                entries.append(entry)
+
+            if len(due_dates) > 0:
+                recurring.next_due = recurring.get_next_date(due_dates[-1])
+                recurring.modified = now
+
+        periods = BudgetPeriod.objects.in_bulk({entry["budget"] for entry in entries if entry.get("budget", None) is not None})
+        for entry in entries:
+            if "budget" in entry:
+                entry["budget"] = periods.get(entry["budget"], None)
+
+        journals = TransactionJournal.bulk_create(entries)
+        RecurringTransaction.objects.bulk_update(recurring_transactions, ["next_due", "modified"])
+
+    return journals
+
+
+def find_duplicates():
+    """Nightly sweep storing the likely duplicate transactions for review on the duplicates page."""
+    return save_duplicates(find_duplicate_transactions())
@@ -0,0 +1,102 @@
+from django.conf import settings
+
+from collections import deque, namedtuple
+from datetime import timedelta
+from difflib import SequenceMatcher
+
+from .models import DuplicateCandidate, Transaction, TransactionJournal
+
+Leg = namedtuple("Leg", ["date", "journal_id", "description", "recurring_id"])
+
+
+def normalize_description(description):
+    return " ".join(description.split()).casefold()
+
+
+def get_similarity(description, other_description, threshold=0.0):
+    """Returns the similarity (``SequenceMatcher`` ratio, from 0 to 1) of two normalized descriptions, or 0 as soon as the
+    cheaper upper bounds show it cannot reach ``threshold``."""
+    if description == other_description:
+        return 1.0
+
+    matcher = SequenceMatcher(None, description, other_description, autojunk=False)
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return 0.0
+
+    return matcher.ratio()
+
+
+def find_duplicates(days=None, threshold=None, since=None, chunk_size=5000):
+    """Returns the likely duplicates in the ledger as a dict of ``(journal id, journal id): (score, days apart)``.
+
+    All legs are read sorted by account, currency, amount and date (one sort in the database, O(n log n)) and swept once,
+    keeping a window of the legs of the last ``days`` days with the same account and amount. Only legs within that window
+    are compared (by their journal's description), so the sweep stays linear in the number of legs for anything but
+    accounts with many identical amounts on the same days. Start, reconciliation and journals of the same recurring
+    transaction are never reported. With ``since``, only pairs of which at least one journal is dated on or after it are."""
+    days = days if days is not None else getattr(settings, "BLACKBOOK_DUPLICATE_DAYS", 3)
+    threshold = threshold if threshold is not None else getattr(settings, "BLACKBOOK_DUPLICATE_THRESHOLD", 0.6)
+
+    legs = Transaction.objects.exclude(
+        journal__type__in=[TransactionJournal.TransactionType.START, TransactionJournal.TransactionType.RECONCILIATION]
+    )
+    if since is not None:
+        legs = legs.filter(date__gte=since - timedelta(days=days))
+
+    legs = legs.order_by("account_id", "amount_currency", "amount", "date", "journal_id").values_list(
+        "account_id", "amount_currency", "amount", "date", "journal_id", "journal__short_description", "journal__recurring_id"
+    )
+
+    duplicates = {}
+    window = deque()
+    window_key = None
+
+    for account_id, currency, amount, date, journal_id, short_description, recurring_id in legs.iterator(chunk_size=chunk_size):
+        if (account_id, currency, amount) != window_key:
+            window.clear()
+            window_key = (account_id, currency, amount)
+
+        while len(window) > 0 and (date - window[0].date).days > days:
+            window.popleft()
+
+        leg = Leg(date=date, journal_id=journal_id, description=normalize_description(short_description), recurring_id=recurring_id)
+
+        for other in window:
+            if other.journal_id == leg.journal_id:
+                continue
+
+            if leg.recurring_id is not None and leg.recurring_id == other.recurring_id:
+                continue
+
+            if since is not None and leg.date < since and other.date < since:
+                continue
+
+            pair = (min(leg.journal_id, other.journal_id), max(leg.journal_id, other.journal_id))
+            # Both legs of a duplicated journal match, pairs that were found already are not scored again
+            if pair in duplicates:
+                continue
+
+            score = get_similarity(leg.description, other.description, threshold)
+            if score >= threshold:
+                duplicates[pair] = (score, (leg.date - other.date).days)
+
+        window.append(leg)
+
+    return duplicates
+
+
+def save_duplicates(duplicates, batch_size=1000):
+    """Stores the pairs returned by ``find_duplicates`` as ``DuplicateCandidate`` (keeping the ones already stored, so
+    dismissed pairs stay dismissed), returns the number of pairs that are new."""
+    existing = DuplicateCandidate.objects.count()
+
+    DuplicateCandidate.objects.bulk_create(
+        [
+            DuplicateCandidate(journal_id=journal_id, duplicate_id=duplicate_id, score=score, days=days)
+            for (journal_id, duplicate_id), (score, days) in duplicates.items()
+        ],
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+
+    return DuplicateCandidate.objects.count() - existing
@@ -0,0 +1,62 @@
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Transaction
+
+import csv
+import json
+
+EXPORT_FIELDS = {
+    "journal": "journal__uuid",
+    "transaction": "uuid",
+    "date": "date",
+    "type": "journal__type",
+    "short_description": "journal__short_description",
+    "description": "journal__description",
+    "category": "journal__category__name",
+    "budget": "journal__budget__budget__name",
+    "account": "account__name",
+    "account_type": "account__type",
+    "amount": "amount",
+    "currency": "amount_currency",
+    "foreign_amount": "foreign_amount",
+    "foreign_currency": "foreign_amount_currency",
+}
+
+
+class Echo:
+    """File-like object handing back whatever is written to it, used to stream csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def get_export_rows(transaction_journals, chunk_size=2000):
+    """Yields one dictionary per transaction of the given journals, reading the database in chunks of ``chunk_size`` rows."""
+    transactions = (
+        Transaction.objects.filter(journal__in=transaction_journals.values("id"))
+        .order_by("date", "journal_id", "id")
+        .values_list(*EXPORT_FIELDS.values())
+    )
+
+    for transaction in transactions.iterator(chunk_size=chunk_size):
+        yield dict(zip(EXPORT_FIELDS.keys(), transaction))
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+
+    yield writer.writerow(EXPORT_FIELDS.keys())
+
+    for row in rows:
+        yield writer.writerow(row.values())
+
+
+def stream_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": {"stream": stream_csv, "content_type": "text/csv", "extension": "csv"},
+    "jsonl": {"stream": stream_jsonl, "content_type": "application/x-ndjson", "extension": "jsonl"},
+}
@@ -1,4 +1,5 @@
 from django import forms
+from django.urls import reverse_lazy
 from django.utils import timezone, safestring
 
 from djmoney.forms.fields import MoneyField
@@ -6,6 +7,8 @@ from djmoney.forms.widgets import MoneyWidget
 
 from .models import get_currency_choices, get_default_currency, Account, TransactionJournal, Category, Budget
 from .utilities import validate_iban, format_iban
+from .search import get_search_backend
+from .registry import get_account_registry
 
 
 class DateInput(forms.DateInput):
@@ -44,23 +47,18 @@ class ListModelChoiceField(forms.ChoiceField):
 
 
 class ListTextWidget(forms.TextInput):
-    def __init__(self, data_list, name, *args, **kwargs):
+    """Text input with a datalist that is filled with suggestions fetched from ``url`` (see js/autocomplete.js) while typing."""
+
+    def __init__(self, url, name, *args, **kwargs):
         super(ListTextWidget, self).__init__(*args, **kwargs)
 
         self._name = name
-        self._list = data_list
-        self.attrs.update({"list": "list__%s" % self._name})
+        self.attrs.update({"list": "list__%s" % self._name, "autocomplete": "off", "data-autocomplete-url": url})
 
     def render(self, name, value, attrs=None, renderer=None):
         text_html = super(ListTextWidget, self).render(name, value, attrs=attrs)
-        data_list = '<datalist id="list__%s">' % self._name
-
-        for item in self._list:
-            data_list += '<option value="%s">%s</option>' % (item, item)
-
-        data_list += "</datalist>"
 
-        return safestring.mark_safe(text_html + data_list)
+        return safestring.mark_safe(text_html + '<datalist id="list__%s"></datalist>' % self._name)
 
 
 class UserProfileForm(forms.Form):
@@ -95,20 +93,17 @@ class TransactionForm(forms.Form):
     def __init__(self, user, *args, **kwargs):
         super(TransactionForm, self).__init__(*args, **kwargs)
 
-        accounts = Account.objects.filter(active=True).order_by("type", "name")
-        account_list = ["{type} - {account.name}".format(type=account.get_type_display(), account=account) for account in accounts]
-
         self.fields["source_account"].widget = ListTextWidget(
-            data_list=account_list, name="source_account_list", attrs={"placeholder": "Select account"}
+            url=reverse_lazy("blackbook:autocomplete_accounts"), name="source_account_list", attrs={"placeholder": "Select account"}
         )
         self.fields["destination_account"].widget = ListTextWidget(
-            data_list=account_list, name="destination_account_list", attrs={"placeholder": "Select account"}
+            url=reverse_lazy("blackbook:autocomplete_accounts"), name="destination_account_list", attrs={"placeholder": "Select account"}
         )
         self.fields["category"].widget = ListTextWidget(
-            data_list=Category.objects.all(), name="category_list", attrs={"placeholder": "Select category"}
+            url=reverse_lazy("blackbook:autocomplete_categories"), name="category_list", attrs={"placeholder": "Select category"}
         )
         self.fields["budget"].widget = ListTextWidget(
-            data_list=Budget.objects.filter(active=True).all(), name="budget_list", attrs={"placeholder": "Select budget"}
+            url=reverse_lazy("blackbook:autocomplete_budgets"), name="budget_list", attrs={"placeholder": "Select budget"}
         )
         self.fields["amount"].inital = ["0", get_default_currency(user=user)]
 
@@ -159,19 +154,102 @@ class TransactionFilterForm(forms.Form):
     def __init__(self, *args, **kwargs):
         super(TransactionFilterForm, self).__init__(*args, **kwargs)
 
-        accounts = Account.objects.filter(active=True).order_by("type", "name")
-        account_list = ["{type} - {account.name}".format(type=account.get_type_display(), account=account) for account in accounts]
-
         self.fields["account"].widget = ListTextWidget(
-            data_list=account_list, name="account-list", attrs={"placeholder": "Select account", "size": 40}
+            url=reverse_lazy("blackbook:autocomplete_accounts"), name="account-list", attrs={"placeholder": "Select account", "size": 40}
         )
         self.fields["category"].widget = ListTextWidget(
-            data_list=Category.objects.all(), name="category_list", attrs={"placeholder": "Select category"}
+            url=reverse_lazy("blackbook:autocomplete_categories"), name="category_list", attrs={"placeholder": "Select category"}
         )
         self.fields["budget"].widget = ListTextWidget(
-            data_list=Budget.objects.filter(active=True).all(), name="budget_list", attrs={"placeholder": "Select budget"}
+            url=reverse_lazy("blackbook:autocomplete_budgets"), name="budget_list", attrs={"placeholder": "Select budget"}
         )
 
+    def filter(self, transaction_journals, filter_dates=False):
+        """Applies the description, account, category and budget filters of a valid form to a queryset of journals.
+
+        The start and end date are only applied when ``filter_dates`` is set, leaving out a date means no bound."""
+        if filter_dates and self.cleaned_data["start_date"] is not None:
+            transaction_journals = transaction_journals.filter(date__gte=self.cleaned_data["start_date"])
+
+        if filter_dates and self.cleaned_data["end_date"] is not None:
+            transaction_journals = transaction_journals.filter(date__lte=self.cleaned_data["end_date"])
+
+        if self.cleaned_data["description"] != "":
+            transaction_journals = get_search_backend().filter(transaction_journals, self.cleaned_data["description"])
+
+        if self.cleaned_data["account"] != "":
+            account = get_account_registry().get(self.cleaned_data["account"])
+            if account is None:
+                raise Account.DoesNotExist("Account %s does not exist" % self.cleaned_data["account"])
+
+            transaction_journals = transaction_journals.filter(transactions__account_id=account.id)
+
+        if self.cleaned_data["category"] != "":
+            transaction_journals = transaction_journals.filter(category__name__icontains=self.cleaned_data["category"])
+
+        if self.cleaned_data["budget"] != "":
+            transaction_journals = transaction_journals.filter(budget__budget__name__icontains=self.cleaned_data["budget"])
+
+        return transaction_journals
+
+
+class TransactionBulkEditForm(forms.Form):
+    category = forms.CharField(required=False)
+    budget = forms.CharField(required=False)
+    date = forms.DateField(required=False, widget=DateInput)
+    remove_category = forms.BooleanField(required=False, help_text="Remove the category from the transactions.")
+    remove_budget = forms.BooleanField(required=False, help_text="Remove the budget from the transactions.")
+
+    def __init__(self, *args, **kwargs):
+        super(TransactionBulkEditForm, self).__init__(*args, **kwargs)
+
+        self.fields["category"].widget = ListTextWidget(
+            url=reverse_lazy("blackbook:autocomplete_categories"), name="bulk_category_list", attrs={"placeholder": "Set category"}
+        )
+        self.fields["budget"].widget = ListTextWidget(
+            url=reverse_lazy("blackbook:autocomplete_budgets"), name="bulk_budget_list", attrs={"placeholder": "Set budget"}
+        )
+
+    def clean(self):
+        cleaned_data = super().clean()
+
+        if cleaned_data.get("category", "") != "" and cleaned_data.get("remove_category"):
+            self.add_error("remove_category", "Either set or remove the category.")
+
+        if cleaned_data.get("budget", "") != "" and cleaned_data.get("remove_budget"):
+            self.add_error("remove_budget", "Either set or remove the budget.")
+
+        if (
+            cleaned_data.get("category", "") == ""
+            and cleaned_data.get("budget", "") == ""
+            and cleaned_data.get("date") is None
+            and not cleaned_data.get("remove_category")
+            and not cleaned_data.get("remove_budget")
+        ):
+            raise forms.ValidationError("Nothing to change, set a category, budget or date.")
+
+        return cleaned_data
+
+    def get_changes(self):
+        """Returns the changes of a valid form in the format of ``TransactionJournal.bulk_edit``, unknown categories and
+        budgets are created."""
+        changes = {}
+
+        if self.cleaned_data["remove_category"]:
+            changes["category"] = None
+        elif self.cleaned_data["category"] != "":
+            changes["category"], _ = Category.objects.get_or_create(name=self.cleaned_data["category"])
+
+        if self.cleaned_data["remove_budget"]:
+            changes["budget"] = None
+        elif self.cleaned_data["budget"] != "":
+            changes["budget"], _ = Budget.objects.get_or_create(name=self.cleaned_data["budget"])
+
+        if self.cleaned_data["date"] is not None:
+            changes["date"] = self.cleaned_data["date"]
+
+        return changes
+
 
 class CategoryForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from ...models import TransactionJournal
+from ...rules import apply_rules_to_journals
+
+
+class Command(BaseCommand):
+    help = "Runs the categorization rules over the existing transactions, filling in missing categories and budgets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--overwrite", action="store_true", help="Replace categories and budgets that are already set when a rule matches.")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Number of journals matched at once.")
+
+    def handle(self, *args, **options):
+        count = apply_rules_to_journals(TransactionJournal.objects.all(), overwrite=options["overwrite"], chunk_size=options["chunk_size"])
+
+        self.stdout.write(self.style.SUCCESS("Categorized {count} transactions.".format(count=count)))
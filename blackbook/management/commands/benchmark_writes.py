@@ -0,0 +1,130 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction as db_transaction
+from django.utils import timezone
+
+from djmoney.money import Money
+
+from ...models import get_default_currency, Account, TransactionJournal
+from ...concurrency import logger as concurrency_logger
+
+from decimal import Decimal
+
+import logging
+import threading
+import time
+
+BENCHMARK_DESCRIPTION = "Write benchmark"
+
+
+class RetryCounter(logging.Handler):
+    """Counts the retry messages logged by ``retry_on_conflict`` (``Handler.handle`` already serializes the calls to ``emit``)."""
+
+    def __init__(self):
+        super().__init__(level=logging.INFO)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+class Command(BaseCommand):
+    help = "Creates journals from several threads at once (on the same accounts by default) and reports throughput, retried conflicts and failures."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=4, help="Number of parallel writers.")
+        parser.add_argument("--journals", type=int, default=50, help="Number of journals created by every writer.")
+        parser.add_argument("--keep", action="store_true", help="Keep the created journals instead of deleting them afterwards.")
+        parser.add_argument(
+            "--separate-accounts",
+            action="store_true",
+            help="Give every writer its own asset account, so writers only contend on the shared net worth snapshots.",
+        )
+
+    def handle(self, *args, **options):
+        if options["writers"] < 1 or options["journals"] < 1:
+            raise CommandError("--writers and --journals should be at least 1")
+
+        currency = get_default_currency()
+        sources = [
+            Account.objects.get_or_create(name=name, type=Account.AccountType.ASSET_ACCOUNT, defaults={"currency": currency})[0]
+            for name in (
+                ["{description} {writer}".format(description=BENCHMARK_DESCRIPTION, writer=writer) for writer in range(options["writers"])]
+                if options["separate_accounts"]
+                else [BENCHMARK_DESCRIPTION]
+            )
+        ]
+        destination, _ = Account.objects.get_or_create(
+            name=BENCHMARK_DESCRIPTION, type=Account.AccountType.EXPENSE_ACCOUNT, defaults={"currency": currency}
+        )
+
+        counter = RetryCounter()
+        concurrency_logger.addHandler(counter)
+        concurrency_logger.setLevel(logging.INFO)
+
+        failures = []
+        barrier = threading.Barrier(options["writers"])
+
+        def write(writer):
+            source = sources[writer % len(sources)]
+            barrier.wait()
+
+            try:
+                for index in range(options["journals"]):
+                    amount = Money(Decimal(writer * options["journals"] + index + 1) / 100, currency)
+
+                    try:
+                        TransactionJournal.create(
+                            transactions={
+                                "short_description": "{description} {writer}-{index}".format(
+                                    description=BENCHMARK_DESCRIPTION, writer=writer, index=index
+                                ),
+                                "date": timezone.localdate(),
+                                "type": TransactionJournal.TransactionType.WITHDRAWAL,
+                                "transactions": [{"account": source, "amount": -1 * amount}, {"account": destination, "amount": amount}],
+                            }
+                        )
+                    except Exception as error:
+                        failures.append(error)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=write, args=(writer,)) for writer in range(options["writers"])]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - start
+
+        concurrency_logger.removeHandler(counter)
+
+        journals = TransactionJournal.objects.filter(short_description__startswith=BENCHMARK_DESCRIPTION, transactions__account=destination)
+        created = journals.count()
+
+        self.stdout.write(
+            "{writers} writers, {created} journals in {duration:.2f}s ({rate:.1f} journals/s), {retries} retried conflicts, {failures} failures".format(
+                writers=options["writers"],
+                created=created,
+                duration=duration,
+                rate=created / duration,
+                retries=counter.count,
+                failures=len(failures),
+            )
+        )
+
+        for source in sources:
+            balance = source.balances.order_by("date").last()
+
+            if balance is not None:
+                self.stdout.write("Balance of {account}: {balance}".format(account=source, balance=balance.balance))
+
+        for error in failures[:5]:
+            self.stderr.write(repr(error))
+
+        if not options["keep"]:
+            with db_transaction.atomic():
+                journals.delete()
+                for source in sources:
+                    source.delete()
+                destination.delete()
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...export import get_export_rows, EXPORT_FORMATS
+from ...forms import TransactionFilterForm
+from ...models import Account, TransactionJournal
+
+
+class Command(BaseCommand):
+    help = "Streams all transactions (optionally filtered like the transactions page) as CSV or JSON lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS.keys(), default="csv")
+        parser.add_argument("--output", default=None, help="File to write to, defaults to standard output.")
+        parser.add_argument("--start-date", default=None, help="Only export transactions on or after this date (YYYY-MM-DD).")
+        parser.add_argument("--end-date", default=None, help="Only export transactions on or before this date (YYYY-MM-DD).")
+        parser.add_argument("--description", default="")
+        parser.add_argument("--account", default="", help='Account as "Type - Name".')
+        parser.add_argument("--category", default="")
+        parser.add_argument("--budget", default="")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Number of rows read from the database at once.")
+
+    def handle(self, *args, **options):
+        filter_form = TransactionFilterForm(
+            {key: options[key] or "" for key in ["start_date", "end_date", "description", "account", "category", "budget"]}
+        )
+
+        if not filter_form.is_valid():
+            raise CommandError(filter_form.errors.as_text())
+
+        try:
+            transaction_journals = filter_form.filter(TransactionJournal.objects.all(), filter_dates=True)
+        except Account.DoesNotExist:
+            raise CommandError("Account %s does not exist" % options["account"])
+        rows = EXPORT_FORMATS[options["format"]]["stream"](get_export_rows(transaction_journals, chunk_size=options["chunk_size"]))
+
+        if options["output"] is None:
+            for line in rows:
+                self.stdout.write(line, ending="")
+
+        else:
+            with open(options["output"], "w", newline="") as output:
+                output.writelines(rows)
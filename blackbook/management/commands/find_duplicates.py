@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from datetime import date
+
+from ...duplicates import find_duplicates, save_duplicates
+
+
+class Command(BaseCommand):
+    help = "Finds likely duplicate transactions (same account and amount, close dates, similar descriptions) and stores them for review."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Maximum number of days between duplicates (BLACKBOOK_DUPLICATE_DAYS).")
+        parser.add_argument(
+            "--threshold", type=float, default=None, help="Minimum description similarity, from 0 to 1 (BLACKBOOK_DUPLICATE_THRESHOLD)."
+        )
+        parser.add_argument(
+            "--since", type=date.fromisoformat, default=None, help="Only look for duplicates of transactions on or after this date (YYYY-MM-DD)."
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Number of rows read from the database at once.")
+
+    def handle(self, *args, **options):
+        duplicates = find_duplicates(days=options["days"], threshold=options["threshold"], since=options["since"], chunk_size=options["chunk_size"])
+        count = save_duplicates(duplicates)
+
+        self.stdout.write(self.style.SUCCESS("Found {found} likely duplicates, {count} of them new.".format(found=len(duplicates), count=count)))
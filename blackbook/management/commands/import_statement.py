@@ -0,0 +1,245 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from djmoney.money import Money
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from ...models import Account, TransactionJournal
+from ...registry import get_account_registry, parse_account_label
+from ...transfers import pair_transfers
+
+import csv
+import json
+import time
+
+DEFAULT_PROFILE = {
+    "format": "csv",
+    "delimiter": ",",
+    "encoding": "utf-8",
+    "date": "date",
+    "date_format": "%Y-%m-%d",
+    "amount": "amount",
+    "debit": None,
+    "credit": None,
+    "decimal_separator": ".",
+    "thousands_separator": "",
+    "short_description": "description",
+    "description": None,
+    "counterparty": "counterparty",
+}
+
+
+class Command(BaseCommand):
+    help = "Streams a bank statement (CSV or JSON lines) into the ledger for the given account, using batched inserts (rows imported before are skipped)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="Path to the statement file.")
+        parser.add_argument("account", help='Account the statement belongs to, as "Type - Name" or the account slug.')
+        parser.add_argument(
+            "--profile",
+            default=None,
+            help="Name of a profile in the BLACKBOOK_IMPORT_PROFILES setting or path to a JSON file mapping the statement columns.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of journals inserted per batch.")
+        parser.add_argument(
+            "--no-transfers",
+            action="store_true",
+            help="Do not merge rows with their counterpart imported from the statement of another owned account into transfers.",
+        )
+
+    def handle(self, *args, **options):
+        profile = self._get_profile(options["profile"])
+        account = self._get_account(options["account"])
+
+        self.counterparties = {}
+        start_time = time.monotonic()
+        row_count = 0
+        skipped_count = 0
+        transfer_count = 0
+
+        with open(options["file"], newline="", encoding=profile["encoding"]) as statement:
+            rows = self._read_rows(statement, profile)
+            entries = self._parse_rows(rows, profile)
+            specs = self._build_specs(entries, account)
+
+            from_dates = {}
+            try:
+                for batch in self._batch(specs, options["batch_size"]):
+                    journals = TransactionJournal.bulk_create(batch, update_snapshots=False)
+                    TransactionJournal.get_snapshot_dates(batch, from_dates=from_dates)
+                    row_count += len(journals)
+                    skipped_count += len(batch) - len(journals)
+
+                    if not options["no_transfers"]:
+                        transfers = pair_transfers(
+                            TransactionJournal.objects.filter(imported=True),
+                            journal_ids=[journal.pk for journal in journals],
+                            update_snapshots=False,
+                            from_dates=from_dates,
+                        )
+                        transfer_count += len(transfers)
+
+                    if options["verbosity"] > 1:
+                        self.stdout.write(
+                            "{count} rows imported ({rate:.0f} rows/sec)".format(count=row_count, rate=self._rate(row_count, start_time))
+                        )
+
+            finally:
+                # Batches are committed as they go, refresh the snapshots of the ones imported when a row fails or the import is interrupted
+                TransactionJournal.update_snapshots(from_dates=from_dates)
+
+        if transfer_count > 0:
+            self.stdout.write("Merged {count} rows with their counterpart into transfers.".format(count=transfer_count))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Imported {count} rows into {type} - {account.name} in {duration:.1f}s ({rate:.0f} rows/sec), skipped {skipped} rows imported before.".format(
+                    count=row_count,
+                    skipped=skipped_count,
+                    type=account.get_type_display(),
+                    account=account,
+                    duration=time.monotonic() - start_time,
+                    rate=self._rate(row_count, start_time),
+                )
+            )
+        )
+
+    def _rate(self, count, start_time):
+        return count / max(time.monotonic() - start_time, 1e-9)
+
+    def _get_profile(self, name):
+        profile = dict(DEFAULT_PROFILE)
+
+        if name is None:
+            return profile
+
+        profiles = getattr(settings, "BLACKBOOK_IMPORT_PROFILES", {})
+        if name in profiles:
+            profile.update(profiles[name])
+            return profile
+
+        try:
+            with open(name) as profile_file:
+                profile.update(json.load(profile_file))
+        except (OSError, ValueError) as error:
+            raise CommandError("Unknown import profile %s (%s)" % (name, error))
+
+        return profile
+
+    def _get_account(self, label):
+        registry = get_account_registry()
+        entry = registry.get_by_slug(label) or registry.get(label, default_type=None)
+
+        if entry is None:
+            raise CommandError("Account %s does not exist" % label)
+
+        return Account.objects.get(pk=entry.id)
+
+    def _read_rows(self, statement, profile):
+        if profile["format"] == "jsonl":
+            for line in statement:
+                if line.strip() != "":
+                    yield json.loads(line)
+
+        else:
+            yield from csv.DictReader(statement, delimiter=profile["delimiter"])
+
+    def _parse_amount(self, value, profile):
+        value = (value or "").strip()
+        if value == "":
+            return Decimal(0)
+
+        if profile["thousands_separator"] != "":
+            value = value.replace(profile["thousands_separator"], "")
+
+        return Decimal(value.replace(profile["decimal_separator"], "."))
+
+    def _parse_rows(self, rows, profile):
+        for line_number, row in enumerate(rows, start=1):
+            try:
+                if profile["debit"] is not None or profile["credit"] is not None:
+                    amount = self._parse_amount(row.get(profile["credit"], None), profile) - abs(
+                        self._parse_amount(row.get(profile["debit"], None), profile)
+                    )
+                else:
+                    amount = self._parse_amount(row[profile["amount"]], profile)
+
+                yield {
+                    "date": datetime.strptime(row[profile["date"]].strip(), profile["date_format"]).date(),
+                    "amount": amount,
+                    "short_description": row[profile["short_description"]].strip()[:150],
+                    "description": row[profile["description"]].strip() if profile["description"] is not None else None,
+                    "counterparty": (row.get(profile["counterparty"], None) or "").strip() if profile["counterparty"] is not None else "",
+                }
+
+            except (KeyError, ValueError, InvalidOperation) as error:
+                raise CommandError("Could not parse row %s: %s (%s)" % (line_number, row, error))
+
+    def _get_counterparty(self, label, amount, account):
+        default_type = Account.AccountType.REVENUE_ACCOUNT if amount > 0 else Account.AccountType.EXPENSE_ACCOUNT
+        account_type, account_name = parse_account_label(label, default_type=default_type)
+
+        key = (account_type, account_name)
+        if key not in self.counterparties:
+            self.counterparties[key], created = Account.objects.get_or_create(
+                name=account_name,
+                type=account_type,
+                defaults={"type": account_type, "net_worth": False, "dashboard": False, "currency": account.currency},
+            )
+
+            if created:
+                self.stdout.write('Account "{account.name}" was created.'.format(account=self.counterparties[key]))
+
+        return self.counterparties[key]
+
+    def _build_specs(self, entries, account):
+        occurrences = {}
+        current_date = None
+        done_dates = set()
+
+        for entry in entries:
+            if entry["amount"] == 0:
+                continue
+
+            # Rows are numbered per day, the statement has to list the rows of a day together (they are ordered by date)
+            if entry["date"] != current_date:
+                if entry["date"] in done_dates:
+                    raise CommandError("Rows of %s are not listed together, the statement should be ordered by date" % entry["date"])
+
+                done_dates.add(current_date)
+                current_date = entry["date"]
+                occurrences = {}
+
+            # Identical rows within one statement are real (e.g. two coffees on a day), number them so they get their own fingerprint
+            key = (entry["amount"], " ".join(entry["short_description"].split()).casefold(), entry["counterparty"])
+            occurrences[key] = occurrences.get(key, -1) + 1
+
+            amount = Money(entry["amount"], account.currency)
+            transactions = [{"account": account, "amount": amount}]
+
+            if entry["counterparty"] != "":
+                transactions.append({"account": self._get_counterparty(entry["counterparty"], entry["amount"], account), "amount": -amount})
+
+            yield {
+                "short_description": entry["short_description"],
+                "description": entry["description"],
+                "date": entry["date"],
+                "type": TransactionJournal.TransactionType.DEPOSIT if entry["amount"] > 0 else TransactionJournal.TransactionType.WITHDRAWAL,
+                "transactions": transactions,
+                "imported": True,
+                "occurrence": occurrences[key],
+            }
+
+    def _batch(self, items, size):
+        batch = []
+
+        for item in items:
+            batch.append(item)
+
+            if len(batch) >= size:
+                yield batch
+                batch = []
+
+        if len(batch) > 0:
+            yield batch
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from ...models import TransactionJournal
+from ...transfers import find_transfer_pairs
+
+
+class Command(BaseCommand):
+    help = "Merges withdrawals and deposits moving the same amount between two owned accounts within a few days into transfers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Maximum number of days between both halves (BLACKBOOK_TRANSFER_DAYS).")
+        parser.add_argument("--all", action="store_true", help="Also pair transactions that were entered by hand, not only imported ones.")
+        parser.add_argument("--dry-run", action="store_true", help="Only list the pairs that would be merged.")
+
+    def handle(self, *args, **options):
+        transaction_journals = TransactionJournal.objects.all() if options["all"] else TransactionJournal.objects.filter(imported=True)
+        pairs = find_transfer_pairs(transaction_journals, days=options["days"])
+
+        if options["dry_run"]:
+            journals = TransactionJournal.objects.in_bulk([journal_id for pair in pairs for journal_id in pair])
+
+            for withdrawal_id, deposit_id in pairs:
+                self.stdout.write(
+                    "{withdrawal.date} {withdrawal.short_description} / {deposit.date} {deposit.short_description}: {deposit.amount}".format(
+                        withdrawal=journals[withdrawal_id], deposit=journals[deposit_id]
+                    )
+                )
+
+            self.stdout.write(self.style.SUCCESS("Found {count} transfers.".format(count=len(pairs))))
+            return
+
+        transfers = TransactionJournal.merge_transfers(pairs)
+
+        self.stdout.write(self.style.SUCCESS("Merged {count} transfers.".format(count=len(transfers))))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from ...models import Account, AccountBalance, NetWorthSnapshot
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the daily balance snapshots of all accounts (or only the given account slugs) and the daily net worth from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("accounts", nargs="*", help="Slugs of the accounts to rebuild, defaults to all accounts.")
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.all()
+
+        if len(options["accounts"]) > 0:
+            accounts = accounts.filter(slug__in=options["accounts"])
+
+        for account in accounts:
+            AccountBalance.update_for_account(account=account)
+
+            if options["verbosity"] > 1:
+                self.stdout.write("Rebuilt balances for {type} - {account.name}".format(type=account.get_type_display(), account=account))
+
+        NetWorthSnapshot.update_from_date()
+
+        self.stdout.write(self.style.SUCCESS("Rebuilt balance snapshots for {count} account(s) and the net worth.".format(count=accounts.count())))
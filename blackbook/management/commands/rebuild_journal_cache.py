@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction as db_transaction
+from django.db.models import Prefetch
+
+from ...models import Transaction, TransactionJournal
+from ...cache import bump_generation
+
+
+class Command(BaseCommand):
+    help = "Recomputes the source accounts, destination accounts, amount and fingerprint stored on every transaction journal, in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Number of journals read and written at once.")
+
+    def handle(self, *args, **options):
+        legs = Prefetch("transactions", queryset=Transaction.objects.select_related("account").order_by("id"))
+        journal_ids = list(TransactionJournal.objects.order_by("id").values_list("id", flat=True))
+        count = 0
+
+        for index in range(0, len(journal_ids), options["chunk_size"]):
+            journals = list(TransactionJournal.objects.filter(id__in=journal_ids[index : index + options["chunk_size"]]).prefetch_related(legs))
+
+            for journal in journals:
+                journal_legs = [{"account": transaction.account, "amount": transaction.amount} for transaction in journal.transactions.all()]
+
+                journal._update_accounts_from_transactions(transactions=journal_legs)
+                journal._update_fingerprint(transactions=journal_legs)
+
+            with db_transaction.atomic():
+                TransactionJournal.objects.bulk_update(
+                    journals, ["source_accounts", "destination_accounts", "amount", "amount_currency", "fingerprint"]
+                )
+
+            count += len(journals)
+            if options["verbosity"] > 1:
+                self.stdout.write("{count} journals updated".format(count=count))
+
+        bump_generation("dashboard")
+
+        self.stdout.write(self.style.SUCCESS("Rebuilt the cached accounts and amount of {count} journals.".format(count=count)))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from ...search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index of the transaction descriptions."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+
+        self.stdout.write(self.style.SUCCESS("Rebuilt the search index ({backend}).".format(backend=backend.__class__.__name__)))
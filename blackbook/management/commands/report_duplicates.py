@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max, Min
+
+from ...models import TransactionJournal
+
+
+class Command(BaseCommand):
+    help = "Lists groups of transactions with the same fingerprint (date, description, accounts and amounts), using one grouped query."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None, help="Only list this many groups, largest first.")
+
+    def handle(self, *args, **options):
+        collisions = (
+            TransactionJournal.objects.exclude(fingerprint=None)
+            .values("fingerprint")
+            .annotate(count=Count("id"), date=Min("date"), short_description=Min("short_description"), first_id=Min("id"), last_id=Max("id"))
+            .filter(count__gt=1)
+            .order_by("-count", "date", "fingerprint")
+        )
+
+        if options["limit"] is not None:
+            collisions = collisions[: options["limit"]]
+
+        groups = 0
+        for collision in collisions:
+            groups += 1
+            self.stdout.write(
+                "{date} {short_description}: {count} transactions (ids {first_id} to {last_id}, fingerprint {fingerprint:.12})".format(**collision)
+            )
+
+        self.stdout.write(self.style.SUCCESS("Found {groups} groups of duplicate transactions.".format(groups=groups)))
@@ -0,0 +1,68 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:01
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+import djmoney.models.fields
+
+
+def populate_account_balances(apps, schema_editor):
+    Transaction = apps.get_model("blackbook", "Transaction")
+    AccountBalance = apps.get_model("blackbook", "AccountBalance")
+
+    totals = {}
+    snapshots = []
+
+    entries = (
+        Transaction.objects.exclude(account=None)
+        .values("account_id", "amount_currency", "journal__date")
+        .annotate(total=models.Sum("amount"))
+        .order_by("account_id", "amount_currency", "journal__date")
+    )
+
+    for entry in entries.iterator():
+        key = (entry["account_id"], entry["amount_currency"])
+        totals[key] = totals.get(key, 0) + entry["total"]
+
+        snapshots.append(
+            AccountBalance(
+                account_id=entry["account_id"], date=entry["journal__date"], balance=totals[key], balance_currency=entry["amount_currency"]
+            )
+        )
+
+        if len(snapshots) >= 1000:
+            AccountBalance.objects.bulk_create(snapshots)
+            snapshots = []
+
+    AccountBalance.objects.bulk_create(snapshots)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0058_bonus_paycheck_paycheckitem_paycheckitemcategory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('balance_currency', djmoney.models.fields.CurrencyField(choices=[('ALL', 'Albanian Lek'), ('AMD', 'Armenian Dram'), ('AZN', 'Azerbaijani Manat'), ('BYN', 'Belarusian Ruble'), ('BAM', 'Bosnia-Herzegovina Convertible Mark'), ('GBP', 'British Pound'), ('BGN', 'Bulgarian Lev'), ('HRK', 'Croatian Kuna'), ('CZK', 'Czech Koruna'), ('DKK', 'Danish Krone'), ('EUR', 'Euro'), ('GEL', 'Georgian Lari'), ('HUF', 'Hungarian Forint'), ('ISK', 'Icelandic Króna'), ('MKD', 'Macedonian Denar'), ('MDL', 'Moldovan Leu'), ('NOK', 'Norwegian Krone'), ('PLN', 'Polish Zloty'), ('RON', 'Romanian Leu'), ('RUB', 'Russian Ruble'), ('RSD', 'Serbian Dinar'), ('SEK', 'Swedish Krona'), ('CHF', 'Swiss Franc'), ('TRY', 'Turkish Lira'), ('UAH', 'Ukrainian Hryvnia')], default='EUR', editable=False, max_length=3)),
+                ('balance', djmoney.models.fields.MoneyField(decimal_places=2, default=Decimal('0'), max_digits=15, verbose_name='balance')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='blackbook.account')),
+            ],
+            options={
+                'ordering': ['account', 'date'],
+                'get_latest_by': 'date',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='accountbalance',
+            constraint=models.UniqueConstraint(fields=('account', 'balance_currency', 'date'), name='unique_account_balance'),
+        ),
+        migrations.RunPython(populate_account_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:04
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def copy_journal_dates(apps, schema_editor):
+    Transaction = apps.get_model("blackbook", "Transaction")
+    TransactionJournal = apps.get_model("blackbook", "TransactionJournal")
+
+    chunk_size = 5000
+    last_id = Transaction.objects.aggregate(last_id=models.Max("id"))["last_id"] or 0
+
+    for start in range(0, last_id + 1, chunk_size):
+        Transaction.objects.filter(id__gte=start, id__lt=start + chunk_size).update(
+            date=models.Subquery(TransactionJournal.objects.filter(id=models.OuterRef("journal_id")).values("date")[:1])
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0059_accountbalance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='date',
+            field=models.DateField(default=django.utils.timezone.localdate, help_text='Copy of the journal date, kept in sync by the journal.'),
+        ),
+        migrations.RunPython(copy_journal_dates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', 'date'], name='transaction_account_date'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['amount_currency', 'date'], name='transaction_currency_date'),
+        ),
+    ]
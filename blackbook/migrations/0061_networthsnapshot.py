@@ -0,0 +1,72 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:06
+
+from decimal import Decimal
+from django.db import migrations, models
+import djmoney.models.fields
+import datetime
+
+
+def populate_net_worth_snapshots(apps, schema_editor):
+    Account = apps.get_model("blackbook", "Account")
+    Transaction = apps.get_model("blackbook", "Transaction")
+    NetWorthSnapshot = apps.get_model("blackbook", "NetWorthSnapshot")
+
+    accounts = Account.objects.filter(active=True, net_worth=True)
+    totals = {entry["currency"]: -entry["total"] for entry in accounts.order_by().values("currency").annotate(total=models.Sum("virtual_balance"))}
+    last_dates = {}
+    snapshots = []
+
+    entries = (
+        Transaction.objects.filter(account__in=accounts)
+        .values("date", "amount_currency")
+        .annotate(total=models.Sum("amount"))
+        .order_by("amount_currency", "date")
+    )
+
+    for entry in entries.iterator():
+        currency = entry["amount_currency"]
+        date = last_dates.get(currency, entry["date"] - datetime.timedelta(days=1)) + datetime.timedelta(days=1)
+
+        while date < entry["date"]:
+            snapshots.append(NetWorthSnapshot(date=date, net_worth=totals[currency], net_worth_currency=currency))
+            date += datetime.timedelta(days=1)
+
+        totals[currency] = totals.get(currency, 0) + entry["total"]
+        last_dates[currency] = entry["date"]
+        snapshots.append(NetWorthSnapshot(date=entry["date"], net_worth=totals[currency], net_worth_currency=currency))
+
+        if len(snapshots) >= 1000:
+            NetWorthSnapshot.objects.bulk_create(snapshots)
+            snapshots = []
+
+    NetWorthSnapshot.objects.bulk_create(snapshots)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0060_transaction_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NetWorthSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('net_worth_currency', djmoney.models.fields.CurrencyField(choices=[('ALL', 'Albanian Lek'), ('AMD', 'Armenian Dram'), ('AZN', 'Azerbaijani Manat'), ('BYN', 'Belarusian Ruble'), ('BAM', 'Bosnia-Herzegovina Convertible Mark'), ('GBP', 'British Pound'), ('BGN', 'Bulgarian Lev'), ('HRK', 'Croatian Kuna'), ('CZK', 'Czech Koruna'), ('DKK', 'Danish Krone'), ('EUR', 'Euro'), ('GEL', 'Georgian Lari'), ('HUF', 'Hungarian Forint'), ('ISK', 'Icelandic Króna'), ('MKD', 'Macedonian Denar'), ('MDL', 'Moldovan Leu'), ('NOK', 'Norwegian Krone'), ('PLN', 'Polish Zloty'), ('RON', 'Romanian Leu'), ('RUB', 'Russian Ruble'), ('RSD', 'Serbian Dinar'), ('SEK', 'Swedish Krona'), ('CHF', 'Swiss Franc'), ('TRY', 'Turkish Lira'), ('UAH', 'Ukrainian Hryvnia')], default='EUR', editable=False, max_length=3)),
+                ('net_worth', djmoney.models.fields.MoneyField(decimal_places=2, default=Decimal('0'), max_digits=15, verbose_name='net worth')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date'],
+                'get_latest_by': 'date',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='networthsnapshot',
+            constraint=models.UniqueConstraint(fields=('net_worth_currency', 'date'), name='unique_net_worth_snapshot'),
+        ),
+        migrations.RunPython(populate_net_worth_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0061_networthsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transactionjournal',
+            index=models.Index(fields=['date', 'created', 'id'], name='journal_date_created_id'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:40
+
+from django.db import migrations, OperationalError
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                "CREATE VIRTUAL TABLE blackbook_transactionjournal_search "
+                "USING fts5(short_description, description, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            # SQLite was built without FTS5, searching falls back to icontains.
+            return
+
+        schema_editor.execute(
+            "INSERT INTO blackbook_transactionjournal_search (rowid, short_description, description) "
+            "SELECT id, short_description, COALESCE(description, '') FROM blackbook_transactionjournal"
+        )
+
+    elif vendor == "postgresql":
+        schema_editor.execute("ALTER TABLE blackbook_transactionjournal ADD COLUMN search_vector tsvector")
+        schema_editor.execute(
+            "UPDATE blackbook_transactionjournal SET search_vector = "
+            "to_tsvector('pg_catalog.simple', COALESCE(short_description, '') || ' ' || COALESCE(description, ''))"
+        )
+        schema_editor.execute("CREATE INDEX blackbook_transactionjournal_search_vector ON blackbook_transactionjournal USING GIN (search_vector)")
+        schema_editor.execute(
+            "CREATE TRIGGER blackbook_transactionjournal_search_vector_update BEFORE INSERT OR UPDATE ON blackbook_transactionjournal "
+            "FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger(search_vector, 'pg_catalog.simple', short_description, description)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS blackbook_transactionjournal_search")
+
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP TRIGGER IF EXISTS blackbook_transactionjournal_search_vector_update ON blackbook_transactionjournal")
+        schema_editor.execute("DROP INDEX IF EXISTS blackbook_transactionjournal_search_vector")
+        schema_editor.execute("ALTER TABLE blackbook_transactionjournal DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0062_journal_date_created_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0063_transactionjournal_search'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='budget',
+            name='name',
+            field=models.CharField(db_index=True, max_length=250),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='name',
+            field=models.CharField(db_index=True, max_length=250),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0064_category_budget_name_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['modified'], name='transaction_modified'),
+        ),
+        migrations.AddIndex(
+            model_name='transactionjournal',
+            index=models.Index(fields=['modified'], name='journal_modified'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0065_modified_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategorizationRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=250)),
+                ('pattern', models.CharField(blank=True, help_text='Text the description should contain (ignoring case), leave empty to match any.', max_length=250)),
+                ('min_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True, verbose_name='minimum amount')),
+                ('max_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True, verbose_name='maximum amount')),
+                ('priority', models.IntegerField(default=100, help_text='When several rules match, the one with the lowest priority wins.')),
+                ('active', models.BooleanField(default=True, verbose_name='active?')),
+                ('uuid', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True, verbose_name='UUID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('account', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='categorization_rules', to='blackbook.account')),
+                ('budget', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='categorization_rules', to='blackbook.budget')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='categorization_rules', to='blackbook.category')),
+            ],
+            options={
+                'ordering': ['priority', 'name'],
+            },
+        ),
+    ]
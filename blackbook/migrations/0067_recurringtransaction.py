@@ -0,0 +1,72 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:52
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import djmoney.models.fields
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0066_categorizationrule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurringTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('short_description', models.CharField(max_length=150)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('amount_currency', djmoney.models.fields.CurrencyField(choices=[('ALL', 'Albanian Lek'), ('AMD', 'Armenian Dram'), ('AZN', 'Azerbaijani Manat'), ('BYN', 'Belarusian Ruble'), ('BAM', 'Bosnia-Herzegovina Convertible Mark'), ('GBP', 'British Pound'), ('BGN', 'Bulgarian Lev'), ('HRK', 'Croatian Kuna'), ('CZK', 'Czech Koruna'), ('DKK', 'Danish Krone'), ('EUR', 'Euro'), ('GEL', 'Georgian Lari'), ('HUF', 'Hungarian Forint'), ('ISK', 'Icelandic Króna'), ('MKD', 'Macedonian Denar'), ('MDL', 'Moldovan Leu'), ('NOK', 'Norwegian Krone'), ('PLN', 'Polish Zloty'), ('RON', 'Romanian Leu'), ('RUB', 'Russian Ruble'), ('RSD', 'Serbian Dinar'), ('SEK', 'Swedish Krona'), ('CHF', 'Swiss Franc'), ('TRY', 'Turkish Lira'), ('UAH', 'Ukrainian Hryvnia')], default='EUR', editable=False, max_length=3)),
+                ('amount', djmoney.models.fields.MoneyField(decimal_places=2, default=Decimal('0'), max_digits=15, verbose_name='amount')),
+                ('periodicity', models.CharField(choices=[('day', 'Daily'), ('week', 'Weekly'), ('month', 'Monthly'), ('quarter', 'Quarterly'), ('half_year', 'Every 6 months'), ('year', 'Yearly')], default='month', max_length=30)),
+                ('start_date', models.DateField(default=django.utils.timezone.localdate)),
+                ('end_date', models.DateField(blank=True, help_text='Leave empty to keep repeating.', null=True)),
+                ('next_due', models.DateField(editable=False)),
+                ('active', models.BooleanField(default=True, verbose_name='active?')),
+                ('uuid', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True, verbose_name='UUID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['next_due', 'short_description'],
+            },
+        ),
+        migrations.AddField(
+            model_name='recurringtransaction',
+            name='budget',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recurring_transactions', to='blackbook.budget'),
+        ),
+        migrations.AddField(
+            model_name='recurringtransaction',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recurring_transactions', to='blackbook.category'),
+        ),
+        migrations.AddField(
+            model_name='recurringtransaction',
+            name='destination_account',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_deposits', to='blackbook.account'),
+        ),
+        migrations.AddField(
+            model_name='recurringtransaction',
+            name='source_account',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_withdrawals', to='blackbook.account'),
+        ),
+        migrations.AddField(
+            model_name='transactionjournal',
+            name='recurring',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='journals', to='blackbook.recurringtransaction'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringtransaction',
+            index=models.Index(fields=['active', 'next_due'], name='recurring_active_next_due'),
+        ),
+        migrations.AddConstraint(
+            model_name='transactionjournal',
+            constraint=models.UniqueConstraint(fields=('recurring', 'date'), name='unique_recurring_date'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:55
+
+from django.db import migrations, models
+
+from blackbook.utilities import get_fingerprint
+
+
+def fill_fingerprints(apps, schema_editor):
+    TransactionJournal = apps.get_model("blackbook", "TransactionJournal")
+    Transaction = apps.get_model("blackbook", "Transaction")
+
+    journal_ids = list(TransactionJournal.objects.order_by("id").values_list("id", flat=True))
+
+    for index in range(0, len(journal_ids), 1000):
+        chunk = journal_ids[index : index + 1000]
+
+        legs = {}
+        for journal_id, account_id, amount, currency in Transaction.objects.filter(journal_id__in=chunk).values_list(
+            "journal_id", "account_id", "amount", "amount_currency"
+        ):
+            legs.setdefault(journal_id, []).append((account_id, amount, currency))
+
+        journals = list(TransactionJournal.objects.filter(id__in=chunk).only("id", "date", "short_description"))
+        for journal in journals:
+            journal.fingerprint = get_fingerprint(journal.date, journal.short_description, legs.get(journal.id, []))
+
+        TransactionJournal.objects.bulk_update(journals, ["fingerprint"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0067_recurringtransaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transactionjournal',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='transactionjournal',
+            name='imported',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(fill_fingerprints, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='transactionjournal',
+            constraint=models.UniqueConstraint(condition=models.Q(('imported', True)), fields=('fingerprint',), name='unique_imported_fingerprint'),
+        ),
+    ]
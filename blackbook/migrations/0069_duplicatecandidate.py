@@ -0,0 +1,41 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.expressions
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0068_transactionjournal_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicateCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text='Similarity of both descriptions, from 0 to 1.')),
+                ('days', models.IntegerField(help_text='Number of days between both transactions.')),
+                ('dismissed', models.BooleanField(default=False, verbose_name='dismissed?')),
+                ('uuid', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True, verbose_name='UUID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('duplicate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blackbook.transactionjournal')),
+                ('journal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_candidates', to='blackbook.transactionjournal')),
+            ],
+            options={
+                'ordering': ['-score', 'days', 'journal'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='duplicatecandidate',
+            constraint=models.UniqueConstraint(fields=('journal', 'duplicate'), name='unique_duplicate_candidate'),
+        ),
+        migrations.AddConstraint(
+            model_name='duplicatecandidate',
+            constraint=models.CheckConstraint(check=models.Q(('journal__lt', django.db.models.expressions.F('duplicate'))), name='duplicate_candidate_ordered'),
+        ),
+    ]
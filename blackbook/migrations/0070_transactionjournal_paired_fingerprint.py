@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0069_duplicatecandidate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transactionjournal',
+            name='paired_fingerprint',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:20
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+PATTERN_INDEXES = [("blackbook_category", "category_name_upper_pattern"), ("blackbook_budget", "budget_name_upper_pattern")]
+
+
+def create_pattern_indexes(apps, schema_editor):
+    # A plain btree on UPPER(name) only serves prefix LIKE lookups in the C locale
+    if schema_editor.connection.vendor == "postgresql":
+        for table, name in PATTERN_INDEXES:
+            schema_editor.execute("CREATE INDEX {name} ON {table} (UPPER(name) text_pattern_ops)".format(name=name, table=table))
+
+
+def drop_pattern_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for table, name in PATTERN_INDEXES:
+            schema_editor.execute("DROP INDEX IF EXISTS {name}".format(name=name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blackbook', '0070_transactionjournal_paired_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='budget',
+            name='name',
+            field=models.CharField(max_length=250),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='name',
+            field=models.CharField(max_length=250),
+        ),
+        migrations.AddIndex(
+            model_name='budget',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='budget_name_upper'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='category_name_upper'),
+        ),
+        migrations.RunPython(create_pattern_indexes, drop_pattern_indexes),
+    ]
@@ -1,8 +1,12 @@
 from .base import get_currency_choices, get_default_currency, get_default_value
 
 from .account import Account
+from .balance import AccountBalance, NetWorthSnapshot
 from .profile import UserProfile
 from .transaction import TransactionJournal, Transaction
 from .category import Category
 from .budget import Budget, BudgetPeriod
 from .paycheck import Paycheck, PayCheckItem, PayCheckItemCategory, Bonus
+from .rule import CategorizationRule
+from .recurring import RecurringTransaction
+from .duplicate import DuplicateCandidate
@@ -1,5 +1,5 @@
 from django.db import models
-from django.db.models import Sum, Q
+from django.db.models import OuterRef, Subquery, Value, F, ExpressionWrapper
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -7,6 +7,7 @@ from django.utils.functional import cached_property
 from localflavor.generic.models import IBANField
 from djmoney.money import Money
 from djmoney.models.fields import CurrencyField
+from model_utils import FieldTracker
 from decimal import Decimal
 
 from .base import get_default_currency, get_currency_choices
@@ -15,6 +16,27 @@ from ..utilities import calculate_period, unique_slugify
 import uuid
 
 
+class AccountQuerySet(models.QuerySet):
+    def with_balances(self, as_of=None):
+        """Annotates every account with its balance at the end of ``as_of`` (or its latest balance when no date is given).
+
+        ``opening_balance`` holds the raw balance, ``adjusted_balance`` the balance corrected for the virtual balance and
+        ``balance_currency`` the currency both amounts are expressed in."""
+        from .balance import AccountBalance
+
+        snapshots = AccountBalance.objects.filter(account=OuterRef("pk"), balance_currency=OuterRef("currency"))
+        if as_of is not None:
+            snapshots = snapshots.filter(date__lte=as_of)
+
+        amount_field = models.DecimalField(max_digits=15, decimal_places=2)
+
+        return self.annotate(
+            opening_balance=Coalesce(Subquery(snapshots.order_by("-date").values("balance")[:1]), Value(Decimal(0)), output_field=amount_field),
+            adjusted_balance=ExpressionWrapper(F("opening_balance") - F("virtual_balance"), output_field=amount_field),
+            balance_currency=F("currency"),
+        )
+
+
 class Account(models.Model):
     class AccountType(models.TextChoices):
         ASSET_ACCOUNT = "assetaccount", "Asset Account"
@@ -43,6 +65,9 @@ class Account(models.Model):
     created = models.DateTimeField(auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
 
+    objects = AccountQuerySet.as_manager()
+    tracker = FieldTracker(fields=["active", "net_worth", "currency", "virtual_balance"])
+
     class Meta:
         ordering = ["name"]
         constraints = [models.UniqueConstraint(fields=["type", "name"], name="unique_account_name")]
@@ -69,9 +94,7 @@ class Account(models.Model):
         from .transaction import TransactionJournal
 
         try:
-            opening_balance = (
-                self.transactions.filter(journal__type=TransactionJournal.TransactionType.START).get(journal__date=self.created.date()).amount
-            )
+            opening_balance = self.transactions.filter(journal__type=TransactionJournal.TransactionType.START).get(date=self.created.date()).amount
 
             return opening_balance
 
@@ -83,11 +106,6 @@ class Account(models.Model):
         return self.balance_until_date()
 
     def balance_until_date(self, date=timezone.localdate()):
-        try:
-            total_amount = self.transactions.filter(journal__date__lte=date).aggregate(total=Coalesce(Sum("amount"), Decimal(0)))["total"]
-            total = Money(total_amount, self.currency)
+        from .balance import AccountBalance
 
-            return total - Money(self.virtual_balance, self.currency)
-
-        except:
-            return Money(0, self.currency) - Money(self.virtual_balance, self.currency)
\ No newline at end of file
+        return AccountBalance.get_balance(account=self, date=date) - Money(self.virtual_balance, self.currency)
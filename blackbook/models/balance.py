@@ -0,0 +1,190 @@
+from django.db import models, transaction
+from django.db.models import Sum, OuterRef, Subquery
+
+from djmoney.models.fields import MoneyField
+from djmoney.money import Money
+from datetime import timedelta
+
+from .base import get_default_currency
+from .account import Account
+from ..concurrency import lock_global
+
+
+class AccountBalance(models.Model):
+    """Running balance of an account at the end of every day it has transactions on, per currency."""
+
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="balances")
+    date = models.DateField()
+    balance = MoneyField("balance", max_digits=15, decimal_places=2, default_currency=get_default_currency(), default=0)
+
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["account", "date"]
+        get_latest_by = "date"
+        constraints = [models.UniqueConstraint(fields=["account", "balance_currency", "date"], name="unique_account_balance")]
+
+    def __str__(self):
+        return "{i.account.name}: {i.date} ({i.balance})".format(i=self)
+
+    @classmethod
+    def update_for_account(cls, account, from_date=None):
+        """Recalculates the snapshots of an account from ``from_date`` onward, or in full when no date is given."""
+        from .transaction import Transaction
+
+        with transaction.atomic():
+            snapshots = cls.objects.filter(account=account)
+            transactions = Transaction.objects.filter(account=account)
+            totals = {}
+
+            if from_date is not None:
+                latest_snapshot = (
+                    cls.objects.filter(account=account, balance_currency=OuterRef("balance_currency"), date__lt=from_date)
+                    .order_by("-date")
+                    .values("date")[:1]
+                )
+                for snapshot in cls.objects.filter(account=account, date=Subquery(latest_snapshot)):
+                    totals[str(snapshot.balance.currency)] = snapshot.balance.amount
+
+                snapshots = snapshots.filter(date__gte=from_date)
+                transactions = transactions.filter(date__gte=from_date)
+
+            snapshots.delete()
+
+            new_snapshots = []
+            for entry in transactions.values("date", "amount_currency").annotate(total=Sum("amount")).order_by("date", "amount_currency"):
+                currency = entry["amount_currency"]
+                totals[currency] = totals.get(currency, 0) + entry["total"]
+
+                new_snapshots.append(cls(account=account, date=entry["date"], balance=Money(totals[currency], currency)))
+
+            cls.objects.bulk_create(new_snapshots, batch_size=1000)
+
+    @classmethod
+    def get_balance(cls, account, date, currency=None):
+        """Returns the balance of an account at the end of ``date`` with a single indexed lookup."""
+        currency = currency if currency is not None else account.currency
+        snapshot = cls.objects.filter(account=account, balance_currency=currency, date__lte=date).order_by("-date").first()
+
+        if snapshot is None:
+            return Money(0, currency)
+
+        return snapshot.balance
+
+
+class NetWorthSnapshot(models.Model):
+    """Total net worth at the end of every day, per currency, of all active accounts included in the net worth."""
+
+    date = models.DateField()
+    net_worth = MoneyField("net worth", max_digits=15, decimal_places=2, default_currency=get_default_currency(), default=0)
+
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["date"]
+        get_latest_by = "date"
+        constraints = [models.UniqueConstraint(fields=["net_worth_currency", "date"], name="unique_net_worth_snapshot")]
+
+    def __str__(self):
+        return "{i.date}: {i.net_worth}".format(i=self)
+
+    @classmethod
+    def update_from_date(cls, from_date=None):
+        """Recalculates the daily net worth from ``from_date`` onward, or in full when no date is given."""
+        from .transaction import Transaction
+
+        accounts = Account.objects.filter(active=True, net_worth=True)
+
+        with transaction.atomic():
+            # The snapshots are shared by all accounts, writers of different accounts would re-insert the same rows
+            lock_global("net_worth", cls)
+
+            snapshots = cls.objects.all()
+            transactions = Transaction.objects.filter(account__in=accounts)
+            totals = {
+                entry["currency"]: -entry["total"]
+                for entry in accounts.order_by().values("currency").annotate(total=Sum("virtual_balance"))
+                if entry["total"] != 0
+            }
+            start_dates = {}
+
+            if from_date is not None:
+                latest_snapshot = (
+                    cls.objects.filter(net_worth_currency=OuterRef("net_worth_currency"), date__lt=from_date).order_by("-date").values("date")[:1]
+                )
+                previous_snapshots = {str(snapshot.net_worth.currency): snapshot for snapshot in cls.objects.filter(date=Subquery(latest_snapshot))}
+
+                for currency, snapshot in previous_snapshots.items():
+                    totals[currency] = snapshot.net_worth.amount
+                    start_dates[currency] = snapshot.date + timedelta(days=1)
+
+                # Only currencies without an earlier snapshot need the history summed up
+                history = transactions.filter(date__lt=from_date).exclude(amount_currency__in=previous_snapshots.keys())
+                for entry in history.values("amount_currency").annotate(total=Sum("amount")).order_by():
+                    currency = entry["amount_currency"]
+
+                    totals[currency] = totals.get(currency, 0) + entry["total"]
+                    start_dates[currency] = from_date
+
+                snapshots = snapshots.filter(date__gte=from_date)
+                transactions = transactions.filter(date__gte=from_date)
+
+            snapshots.delete()
+
+            deltas = {}
+            for entry in transactions.values("date", "amount_currency").annotate(total=Sum("amount")).order_by("date"):
+                currency = entry["amount_currency"]
+
+                deltas.setdefault(currency, {})[entry["date"]] = entry["total"]
+                start_dates.setdefault(currency, entry["date"])
+
+            new_snapshots = []
+            for currency, start_date in start_dates.items():
+                currency_deltas = deltas.get(currency, {})
+                end_date = max([start_date, *currency_deltas.keys()])
+
+                for day in range((end_date - start_date).days + 1):
+                    date = start_date + timedelta(days=day)
+                    totals[currency] = totals.get(currency, 0) + currency_deltas.get(date, 0)
+
+                    new_snapshots.append(cls(date=date, net_worth=Money(totals[currency], currency)))
+
+            cls.objects.bulk_create(new_snapshots, batch_size=1000)
+
+    @classmethod
+    def schedule_update(cls, from_date=None):
+        """Recalculates the net worth once the current database transaction commits (right away outside of one), updates
+        scheduled while it is open are merged into a single recalculation from the earliest date."""
+        for _, callback, *_ in transaction.get_connection().run_on_commit:
+            # A pending callback is only dropped by rolling back a savepoint that is still open, which undoes these changes too
+            if isinstance(callback, _NetWorthUpdate):
+                callback.merge(from_date)
+                return
+
+        transaction.on_commit(_NetWorthUpdate(from_date))
+
+    @classmethod
+    def get_net_worth(cls, currency, date):
+        """Returns the net worth in ``currency`` at the end of ``date`` with a single indexed lookup."""
+        snapshot = cls.objects.filter(net_worth_currency=currency, date__lte=date).order_by("-date").first()
+
+        if snapshot is None:
+            return Money(0, currency)
+
+        return snapshot.net_worth
+
+
+class _NetWorthUpdate:
+    """On commit callback recalculating the net worth from the earliest date scheduled (``None`` for a full rebuild)."""
+
+    def __init__(self, from_date):
+        self.from_date = from_date
+
+    def merge(self, from_date):
+        if self.from_date is not None:
+            self.from_date = None if from_date is None else min(self.from_date, from_date)
+
+    def __call__(self):
+        NetWorthSnapshot.update_from_date(from_date=self.from_date)
@@ -1,6 +1,6 @@
 from django.db import models
 from django.db.models import Sum
-from django.db.models.functions import Coalesce
+from django.db.models.functions import Coalesce, Upper
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.conf import settings
@@ -43,6 +43,8 @@ class Budget(models.Model):
 
     class Meta:
         ordering = ["name"]
+        # Used by the autocomplete prefix lookup, see blackbook/views/autocomplete.py
+        indexes = [models.Index(Upper("name"), name="budget_name_upper")]
 
     def __str__(self):
         return self.name
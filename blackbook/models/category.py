@@ -1,6 +1,6 @@
 from django.db import models
 from django.db.models import Sum
-from django.db.models.functions import Coalesce
+from django.db.models.functions import Coalesce, Upper
 from django.utils.functional import cached_property
 
 from djmoney.money import Money
@@ -21,6 +21,8 @@ class Category(models.Model):
     class Meta:
         verbose_name_plural = "categories"
         ordering = ["name"]
+        # Used by the autocomplete prefix lookup, see blackbook/views/autocomplete.py
+        indexes = [models.Index(Upper("name"), name="category_name_upper")]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,35 @@
+from django.db import models
+from django.db.models import F, Q
+
+from .transaction import TransactionJournal
+
+import uuid
+
+
+class DuplicateCandidate(models.Model):
+    """Pair of journals that look like the same transaction posted twice (same account and amount, dates a few days apart
+    and a similar description), found by the sweep in blackbook/duplicates.py. ``journal`` is always the one with the lowest id."""
+
+    journal = models.ForeignKey(TransactionJournal, on_delete=models.CASCADE, related_name="duplicate_candidates")
+    duplicate = models.ForeignKey(TransactionJournal, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField(help_text="Similarity of both descriptions, from 0 to 1.")
+    days = models.IntegerField(help_text="Number of days between both transactions.")
+    dismissed = models.BooleanField("dismissed?", default=False)
+    uuid = models.UUIDField("UUID", default=uuid.uuid4, editable=False, db_index=True, unique=True)
+
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-score", "days", "journal"]
+        constraints = [
+            models.UniqueConstraint(fields=["journal", "duplicate"], name="unique_duplicate_candidate"),
+            models.CheckConstraint(check=Q(journal__lt=F("duplicate")), name="duplicate_candidate_ordered"),
+        ]
+
+    def __str__(self):
+        return "{journal} / {duplicate}".format(journal=self.journal, duplicate=self.duplicate)
+
+    @property
+    def journals(self):
+        return [self.journal, self.duplicate]
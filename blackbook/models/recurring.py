@@ -0,0 +1,93 @@
+from django.db import models
+from django.utils import timezone
+
+from djmoney.models.fields import MoneyField
+from dateutil.relativedelta import relativedelta
+from datetime import timedelta
+
+from .base import get_default_currency
+from .account import Account
+from .category import Category
+from .budget import Budget
+from ..utilities import calculate_period
+
+import uuid
+
+
+class RecurringTransaction(models.Model):
+    """Transaction that is created every period (a ``Budget.Period``) by the ``create_recurring_transactions`` cron job.
+
+    Every occurrence falls on the same day within its period as ``start_date`` does within the first one (or on the last day
+    of shorter months). ``next_due`` is the date of the first occurrence that was not created yet."""
+
+    short_description = models.CharField(max_length=150)
+    description = models.TextField(blank=True, null=True)
+    amount = MoneyField("amount", max_digits=15, decimal_places=2, default_currency=get_default_currency(), default=0)
+    source_account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="recurring_withdrawals")
+    destination_account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="recurring_deposits")
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, blank=True, null=True, related_name="recurring_transactions")
+    budget = models.ForeignKey(Budget, on_delete=models.SET_NULL, blank=True, null=True, related_name="recurring_transactions")
+    periodicity = models.CharField(max_length=30, choices=Budget.Period.choices, default=Budget.Period.MONTH)
+    start_date = models.DateField(default=timezone.localdate)
+    end_date = models.DateField(blank=True, null=True, help_text="Leave empty to keep repeating.")
+    next_due = models.DateField(editable=False)
+    active = models.BooleanField("active?", default=True)
+    uuid = models.UUIDField("UUID", default=uuid.uuid4, editable=False, db_index=True, unique=True)
+
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["next_due", "short_description"]
+        indexes = [models.Index(fields=["active", "next_due"], name="recurring_active_next_due")]
+
+    def __str__(self):
+        return self.short_description
+
+    def save(self, *args, **kwargs):
+        if self.next_due is None:
+            self.next_due = self.start_date
+
+        super(RecurringTransaction, self).save(*args, **kwargs)
+
+    def get_next_date(self, date):
+        """Returns the date of the occurrence in the period following the one of ``date``."""
+        first_period = calculate_period(periodicity=self.periodicity, start_date=self.start_date)
+        period = calculate_period(
+            periodicity=self.periodicity, start_date=calculate_period(periodicity=self.periodicity, start_date=date)["end_date"] + timedelta(days=1)
+        )
+
+        if self.periodicity in [Budget.Period.DAY, Budget.Period.WEEK]:
+            return period["start_date"] + (self.start_date - first_period["start_date"])
+
+        # Same month within the period and same day within the month (or the last day of shorter months)
+        months = (self.start_date.year - first_period["start_date"].year) * 12 + self.start_date.month - first_period["start_date"].month
+        return period["start_date"] + relativedelta(months=months, day=self.start_date.day)
+
+    def get_due_dates(self, until):
+        """Returns the dates of all occurrences from ``next_due`` up to and including ``until`` (and ``end_date``)."""
+        dates = []
+        date = self.next_due
+
+        while date <= until and (self.end_date is None or date <= self.end_date):
+            dates.append(date)
+            date = self.get_next_date(date)
+
+        return dates
+
+    def get_transactions(self, date):
+        """Returns the occurrence on ``date`` in the ``TransactionJournal.create`` format."""
+        from .transaction import TransactionJournal
+
+        return {
+            "short_description": self.short_description,
+            "description": self.description,
+            "date": date,
+            "type": TransactionJournal.TransactionType.WITHDRAWAL,
+            "category": self.category,
+            "recurring": self,
+            "transactions": [
+                {"account": self.source_account, "amount": -1 * self.amount},
+                {"account": self.destination_account, "amount": self.amount},
+            ],
+        }
@@ -0,0 +1,32 @@
+from django.db import models
+
+from .account import Account
+from .category import Category
+from .budget import Budget
+
+import uuid
+
+
+class CategorizationRule(models.Model):
+    """Sets the category and/or budget of new (or uncategorized) transactions of which the description contains ``pattern``,
+    optionally limited to an absolute amount range and to transactions touching ``account``, see blackbook/rules.py."""
+
+    name = models.CharField(max_length=250)
+    pattern = models.CharField(max_length=250, blank=True, help_text="Text the description should contain (ignoring case), leave empty to match any.")
+    min_amount = models.DecimalField("minimum amount", max_digits=15, decimal_places=2, blank=True, null=True)
+    max_amount = models.DecimalField("maximum amount", max_digits=15, decimal_places=2, blank=True, null=True)
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, blank=True, null=True, related_name="categorization_rules")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, blank=True, null=True, related_name="categorization_rules")
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, blank=True, null=True, related_name="categorization_rules")
+    priority = models.IntegerField(default=100, help_text="When several rules match, the one with the lowest priority wins.")
+    active = models.BooleanField("active?", default=True)
+    uuid = models.UUIDField("UUID", default=uuid.uuid4, editable=False, db_index=True, unique=True)
+
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["priority", "name"]
+
+    def __str__(self):
+        return self.name
@@ -1,14 +1,20 @@
-from django.db import models
+from django.db import models, transaction as db_transaction
+from django.db.models import F, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.functional import cached_property
 
 from djmoney.models.fields import MoneyField
 from djmoney.money import Money
+from model_utils import FieldTracker
 
 from .base import get_default_currency
 from .account import Account
 from .category import Category
 from .budget import BudgetPeriod
+from ..search import get_search_backend
+from ..concurrency import lock_accounts, lock_rows, retry_on_conflict
+from ..utilities import get_fingerprint
 
 import uuid
 
@@ -28,16 +34,30 @@ class TransactionJournal(models.Model):
     uuid = models.UUIDField("UUID", default=uuid.uuid4, editable=False, db_index=True, unique=True)
     budget = models.ForeignKey(BudgetPeriod, on_delete=models.SET_NULL, blank=True, null=True, related_name="transactions")
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, blank=True, null=True, related_name="transactions")
+    recurring = models.ForeignKey("RecurringTransaction", on_delete=models.SET_NULL, blank=True, null=True, related_name="journals")
     source_accounts = models.JSONField(null=True)
     destination_accounts = models.JSONField(null=True)
     amount = MoneyField("amount", max_digits=15, decimal_places=2, default_currency=get_default_currency(), default=0)
+    fingerprint = models.CharField(max_length=64, blank=True, null=True, editable=False, db_index=True)
+    imported = models.BooleanField(default=False, editable=False)
+    paired_fingerprint = models.CharField(max_length=64, blank=True, null=True, editable=False, db_index=True)
 
     created = models.DateTimeField(auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
 
+    tracker = FieldTracker(fields=["date"])
+
     class Meta:
         ordering = ["date", "created"]
         get_latest_by = "date"
+        indexes = [
+            models.Index(fields=["date", "created", "id"], name="journal_date_created_id"),
+            models.Index(fields=["modified"], name="journal_modified"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["recurring", "date"], name="unique_recurring_date"),
+            models.UniqueConstraint(fields=["fingerprint"], condition=models.Q(imported=True), name="unique_imported_fingerprint"),
+        ]
 
     def __str__(self):
         return self.short_description
@@ -88,7 +108,7 @@ class TransactionJournal(models.Model):
 
         return self.TransactionType.DEPOSIT
 
-    def _create_transactions(self, transactions):
+    def _validate_transactions(self, transactions):
         source_accounts = []
         destination_accounts = []
 
@@ -110,34 +130,377 @@ class TransactionJournal(models.Model):
             if str(transaction["amount"].currency) != str(transaction["account"].currency):
                 raise AttributeError("Amount should be in the same currency as the account it relates to (%s)" % transaction)
 
+    def _create_transactions(self, transactions):
+        self._validate_transactions(transactions=transactions)
+
+        for transaction in transactions:
             self.transactions.create(
-                account=transaction["account"], amount=transaction["amount"], foreign_amount=transaction.get("foreign_amount", None)
+                account=transaction["account"],
+                amount=transaction["amount"],
+                foreign_amount=transaction.get("foreign_amount", None),
+                date=self.date,
             )
 
     @classmethod
+    @retry_on_conflict
     def create(cls, transactions):
         """Transactions should be in a fixed format
         {
-            "short_description", "description", "date", "type", "category", "budget", "transactions" [{
+            "short_description", "description", "date", "type", "category", "budget", "recurring", "transactions" [{
                 "account", "amount", "foreign_amount"
             }]
         }"""
-        journal = cls.objects.create(
+        journal = cls(
             date=transactions["date"],
             short_description=transactions["short_description"],
             type=transactions["type"],
             description=transactions.get("description", None),
             category=transactions.get("category", None),
             budget=transactions.get("budget", None),
+            recurring=transactions.get("recurring", None),
         )
 
+        from ..rules import apply_rules
+
         journal.type = journal._verify_transaction_type(type=transactions["type"], transactions=transactions["transactions"])
-        journal._create_transactions(transactions=transactions["transactions"])
-        journal.update_accounts()
+        journal._update_accounts_from_transactions(transactions=transactions["transactions"])
+        journal._update_fingerprint(transactions=transactions["transactions"])
+        apply_rules(journal, transactions["transactions"])
+
+        with db_transaction.atomic():
+            lock_accounts([transaction["account"] for transaction in transactions["transactions"]])
+
+            journal.save()
+            journal._create_transactions(transactions=transactions["transactions"])
 
         return journal
 
+    @classmethod
+    def get_snapshot_dates(cls, transactions, from_dates=None):
+        """Returns the earliest date per account touched by ``transactions`` (in the ``create`` format), merged into ``from_dates``."""
+        from_dates = from_dates if from_dates is not None else {}
+
+        for entry in transactions:
+            for transaction in entry["transactions"]:
+                account = transaction["account"]
+                from_dates[account] = min(from_dates.get(account, entry["date"]), entry["date"])
+
+        return from_dates
+
+    @classmethod
+    def update_snapshots(cls, from_dates):
+        """Refreshes the balance and net worth snapshots for a ``{account: earliest date}`` mapping in one go."""
+        from .balance import AccountBalance, NetWorthSnapshot
+        from ..cache import bump_generation
+
+        if len(from_dates) == 0:
+            return
+
+        for account, from_date in from_dates.items():
+            AccountBalance.update_for_account(account=account, from_date=from_date)
+
+        NetWorthSnapshot.update_from_date(from_date=min(from_dates.values()))
+        db_transaction.on_commit(lambda: bump_generation("dashboard"))
+
+    @classmethod
+    @retry_on_conflict
+    def bulk_create(cls, transactions, batch_size=500, update_snapshots=True):
+        """Creates many journals at once, each entry of ``transactions`` uses the same format as ``create``.
+
+        Journals and their transactions are inserted with a handful of batched queries and the denormalized account fields are
+        filled in from the accounts passed in. The snapshots are refreshed once for the whole batch, callers inserting several
+        batches in a row can pass ``update_snapshots=False`` and call ``update_snapshots`` themselves at the end.
+
+        Entries with ``"imported": True`` (and optionally an ``"occurrence"``, see ``get_fingerprint``) are skipped when a journal
+        with the same fingerprint was imported before, only the journals actually inserted are returned."""
+        from ..rules import apply_rules
+
+        journals = []
+        budget_periods = {}
+        for entry in transactions:
+            journal = cls(
+                date=entry["date"],
+                short_description=entry["short_description"],
+                type=entry["type"],
+                description=entry.get("description", None),
+                category=entry.get("category", None),
+                budget=entry.get("budget", None),
+                recurring=entry.get("recurring", None),
+                imported=entry.get("imported", False),
+            )
+
+            journal.type = journal._verify_transaction_type(type=entry["type"], transactions=entry["transactions"])
+            journal._validate_transactions(transactions=entry["transactions"])
+            journal._update_accounts_from_transactions(transactions=entry["transactions"])
+            journal._update_fingerprint(transactions=entry["transactions"], occurrence=entry.get("occurrence", 0))
+            apply_rules(journal, entry["transactions"], budget_periods=budget_periods)
+
+            journals.append(journal)
+
+        # Imported journals merged into a transfer (see ``merge_transfers``) live on as the paired fingerprint of the transfer
+        fingerprints = [journal.fingerprint for journal in journals if journal.imported]
+        if len(fingerprints) > 0:
+            paired = set()
+            for index in range(0, len(fingerprints), batch_size):
+                paired.update(
+                    cls.objects.filter(paired_fingerprint__in=fingerprints[index : index + batch_size]).values_list("paired_fingerprint", flat=True)
+                )
+
+            transactions = [entry for journal, entry in zip(journals, transactions) if not (journal.imported and journal.fingerprint in paired)]
+            journals = [journal for journal in journals if not (journal.imported and journal.fingerprint in paired)]
+
+        if len(journals) == 0:
+            return journals
+
+        with db_transaction.atomic():
+            lock_accounts([transaction["account"] for entry in transactions for transaction in entry["transactions"]])
+
+            # Imported journals seen before conflict on their fingerprint and are left out (ON CONFLICT DO NOTHING)
+            cls.objects.bulk_create(journals, batch_size=batch_size, ignore_conflicts=any(journal.imported for journal in journals))
+
+            if any(journal.pk is None for journal in journals):
+                journal_ids = {}
+                uuids = [journal.uuid for journal in journals]
+
+                for index in range(0, len(uuids), batch_size):
+                    journal_ids.update(cls.objects.filter(uuid__in=uuids[index : index + batch_size]).values_list("uuid", "id"))
+
+                for journal in journals:
+                    journal.pk = journal_ids.get(journal.uuid, None)
+
+                transactions = [entry for journal, entry in zip(journals, transactions) if journal.pk is not None]
+                journals = [journal for journal in journals if journal.pk is not None]
+
+            Transaction.objects.bulk_create(
+                [
+                    Transaction(
+                        journal=journal,
+                        account=transaction["account"],
+                        amount=transaction["amount"],
+                        foreign_amount=transaction.get("foreign_amount", None),
+                        date=journal.date,
+                    )
+                    for journal, entry in zip(journals, transactions)
+                    for transaction in entry["transactions"]
+                ],
+                batch_size=batch_size,
+            )
+
+            get_search_backend().index(journals)
+
+            if update_snapshots:
+                cls.update_snapshots(from_dates=cls.get_snapshot_dates(transactions))
+
+        return journals
+
+    @classmethod
+    @retry_on_conflict
+    def bulk_edit(cls, transaction_journals, changes, batch_size=500):
+        """Sets the category, budget and/or date of all journals in the ``transaction_journals`` queryset at once.
+
+        ``changes`` holds only the fields to change: "category" (a Category or None), "budget" (a Budget or None, every
+        journal gets the period of the budget covering its date, falling back to the current one) and "date" (journals keep
+        their budget, moving to its period covering the new date). These are applied with an UPDATE per batch of
+        ``batch_size`` journals, bypassing the per-row signals: the balance snapshots (after a date change) and the dashboard
+        cache are refreshed once at the end. Returns the number of journals changed."""
+        from ..cache import bump_generation
+
+        journal_ids = list(transaction_journals.order_by("id").values_list("id", flat=True).distinct())
+        if len(journal_ids) == 0 or len(changes) == 0:
+            return 0
+
+        now = timezone.now()
+        values = {"modified": now}
+
+        if "category" in changes:
+            values["category"] = changes["category"]
+
+        if "date" in changes:
+            values["date"] = changes["date"]
+
+        if "budget" in changes:
+            values["budget"] = None
+
+            if changes["budget"] is not None:
+                budget_period = BudgetPeriod.objects.filter(
+                    budget=changes["budget"], start_date__lte=OuterRef("date"), end_date__gte=OuterRef("date")
+                )
+                values["budget"] = Subquery(budget_period.values("pk")[:1])
+
+                current_period = changes["budget"].current_period
+                if current_period is not None:
+                    values["budget"] = Coalesce(values["budget"], Value(current_period.pk))
+
+        elif "date" in changes:
+            # Journals keep their budget but move to its period covering the new date (or today, or keep the old one)
+            budget_periods = BudgetPeriod.objects.filter(budget__periods=OuterRef("budget"))
+            values["budget"] = Coalesce(
+                Subquery(budget_periods.filter(start_date__lte=OuterRef("date"), end_date__gte=OuterRef("date")).values("pk")[:1]),
+                Subquery(budget_periods.filter(start_date__lte=timezone.localdate(), end_date__gte=timezone.localdate()).values("pk")[:1]),
+                F("budget"),
+            )
+
+        account_ids = []
+        if "date" in changes:
+            account_ids = list(Transaction.objects.filter(journal__in=transaction_journals).values_list("account_id", flat=True).distinct())
+
+        from_dates = {}
+
+        with db_transaction.atomic():
+            lock_accounts(account_ids)
+
+            for index in range(0, len(journal_ids), batch_size):
+                batch = journal_ids[index : index + batch_size]
+
+                if "date" in changes:
+                    for entry in Transaction.objects.filter(journal_id__in=batch).values("account_id").annotate(first_date=Min("date")).order_by():
+                        first_date = min(entry["first_date"], changes["date"])
+                        from_dates[entry["account_id"]] = min(from_dates.get(entry["account_id"], first_date), first_date)
+
+                    Transaction.objects.filter(journal_id__in=batch).update(date=changes["date"], modified=now)
+
+                # The date is set first so the budget period is looked up for the new date
+                if "date" in values and "budget" in values:
+                    cls.objects.filter(id__in=batch).update(date=values["date"], modified=now)
+
+                cls.objects.filter(id__in=batch).update(**values)
+
+                if "date" in changes:
+                    cls.update_fingerprints(batch)
+
+            if len(from_dates) > 0:
+                accounts = Account.objects.in_bulk(from_dates.keys())
+                cls.update_snapshots(from_dates={accounts[account_id]: from_date for account_id, from_date in from_dates.items()})
+            else:
+                db_transaction.on_commit(lambda: bump_generation("dashboard"))
+
+        return len(journal_ids)
+
+    @classmethod
+    @retry_on_conflict
+    def merge_transfers(cls, pairs, batch_size=500, update_snapshots=True, from_dates=None):
+        """Merges pairs of ``(withdrawal id, deposit id)`` journals, each moving the same amount out of one owned account and
+        into another, into a single transfer journal, see blackbook/transfers.py.
+
+        The withdrawal is kept with its date, description and uuid and turned into a transfer between both owned accounts, the
+        counterparty legs and the deposit journal are deleted (the fingerprint of an imported deposit is kept as the
+        ``paired_fingerprint`` of the transfer, so importing its statement again skips it). Pairs of which a journal changed in
+        the meantime are left alone. The snapshots are refreshed once for all pairs, or merged into ``from_dates`` with
+        ``update_snapshots=False``. Returns the transfer journals."""
+        owned_accounts = [Account.AccountType.ASSET_ACCOUNT, Account.AccountType.LIABILITIES_ACCOUNT]
+        journal_ids = [journal_id for pair in pairs for journal_id in pair]
+        if len(journal_ids) == 0:
+            return []
+
+        account_ids = list(Transaction.objects.filter(journal_id__in=journal_ids).values_list("account_id", flat=True).distinct())
+
+        now = timezone.now()
+        from_dates = from_dates if from_dates is not None else {}
+        transfers = []
+        removed_legs = []
+        moved_legs = []
+        removed_journals = []
+
+        with db_transaction.atomic():
+            lock_accounts(account_ids)
+            lock_rows(cls.objects.filter(id__in=journal_ids))
+
+            journals = cls.objects.filter(id__in=journal_ids, type__in=[cls.TransactionType.WITHDRAWAL, cls.TransactionType.DEPOSIT]).in_bulk()
+            legs = {}
+            for transaction in Transaction.objects.filter(journal_id__in=journals.keys()).select_related("account").order_by("id"):
+                legs.setdefault(transaction.journal_id, []).append(transaction)
+
+            for withdrawal_id, deposit_id in pairs:
+                withdrawal, deposit = journals.get(withdrawal_id, None), journals.get(deposit_id, None)
+                if (
+                    withdrawal is None
+                    or deposit is None
+                    or withdrawal.type != cls.TransactionType.WITHDRAWAL
+                    or deposit.type != cls.TransactionType.DEPOSIT
+                ):
+                    continue
+
+                sources = [leg for leg in legs.get(withdrawal_id, []) if leg.account is not None and leg.account.type in owned_accounts]
+                destinations = [leg for leg in legs.get(deposit_id, []) if leg.account is not None and leg.account.type in owned_accounts]
+                if len(sources) != 1 or len(destinations) != 1 or sources[0].amount != -1 * destinations[0].amount:
+                    continue
+
+                source, destination = sources[0], destinations[0]
+                if source.account_id == destination.account_id:
+                    continue
+
+                for leg in legs[withdrawal_id] + legs[deposit_id]:
+                    if leg.account is not None:
+                        from_dates[leg.account] = min(from_dates.get(leg.account, leg.date), leg.date, withdrawal.date)
+
+                    if leg not in [source, destination]:
+                        removed_legs.append(leg.id)
+
+                destination.journal = withdrawal
+                destination.date = withdrawal.date
+                destination.modified = now
+                moved_legs.append(destination)
+
+                transactions = [{"account": source.account, "amount": source.amount}, {"account": destination.account, "amount": destination.amount}]
+                withdrawal.type = cls.TransactionType.TRANSFER
+                withdrawal.category = withdrawal.category if withdrawal.category_id is not None else deposit.category
+                withdrawal.budget = withdrawal.budget if withdrawal.budget_id is not None else deposit.budget
+                withdrawal.paired_fingerprint = deposit.fingerprint if deposit.imported else None
+                withdrawal.modified = now
+                withdrawal._update_accounts_from_transactions(transactions=transactions)
+                withdrawal._update_fingerprint(transactions=transactions)
+
+                transfers.append(withdrawal)
+                removed_journals.append(deposit_id)
+
+            # Raw deletes skip the per-row post_delete signals, the snapshots are refreshed once below
+            for index in range(0, len(removed_legs), batch_size):
+                Transaction.objects.filter(id__in=removed_legs[index : index + batch_size])._raw_delete(using=Transaction.objects.db)
+
+            Transaction.objects.bulk_update(moved_legs, ["journal", "date", "modified"], batch_size=batch_size)
+            for index in range(0, len(removed_journals), batch_size):
+                cls.objects.filter(id__in=removed_journals[index : index + batch_size]).delete()
+
+            cls.objects.bulk_update(
+                transfers,
+                [
+                    "type",
+                    "category",
+                    "budget",
+                    "source_accounts",
+                    "destination_accounts",
+                    "amount",
+                    "amount_currency",
+                    "fingerprint",
+                    "paired_fingerprint",
+                    "modified",
+                ],
+                batch_size=batch_size,
+            )
+
+            if update_snapshots:
+                cls.update_snapshots(from_dates=from_dates)
+
+        return transfers
+
+    @classmethod
+    def update_fingerprints(cls, journal_ids):
+        """Recomputes the fingerprint of the (not imported) journals with the given ids from their stored legs."""
+        legs = {}
+        for journal_id, account_id, amount, currency in Transaction.objects.filter(journal_id__in=journal_ids).values_list(
+            "journal_id", "account_id", "amount", "amount_currency"
+        ):
+            legs.setdefault(journal_id, []).append((account_id, amount, currency))
+
+        journals = list(cls.objects.filter(id__in=journal_ids, imported=False).only("id", "date", "short_description"))
+        for journal in journals:
+            journal.fingerprint = get_fingerprint(journal.date, journal.short_description, legs.get(journal.id, []))
+
+        cls.objects.bulk_update(journals, ["fingerprint"])
+
+    @retry_on_conflict
     def update(self, transactions):
+        """Updates the journal and its legs (same format as ``create``), only the legs that changed are written."""
         self.short_description = transactions["short_description"]
         self.description = transactions["description"]
         self.date = transactions["date"]
@@ -145,36 +508,98 @@ class TransactionJournal(models.Model):
         self.category = transactions.get("category", None)
         self.budget = transactions.get("budget", None)
 
-        self.save()
+        self._validate_transactions(transactions=transactions["transactions"])
+        self._update_accounts_from_transactions(transactions=transactions["transactions"])
+        self._update_fingerprint(transactions=transactions["transactions"])
+
+        with db_transaction.atomic():
+            lock_accounts([transaction["account"] for transaction in transactions["transactions"]], journal=self)
+            lock_rows(type(self).objects.filter(pk=self.pk))
+
+            self.save()
+            self._update_transactions(transactions=transactions["transactions"])
+
+    def _update_transactions(self, transactions):
+        """Matches the new legs to the existing ones by account and sign, updating, inserting and deleting only what differs."""
+        existing = {}
+        for transaction in self.transactions.all():
+            existing.setdefault((transaction.account_id, transaction.amount.amount > 0), []).append(transaction)
 
-        self.transactions.all().delete()
-        self._create_transactions(transactions=transactions["transactions"])
-        self.update_accounts()
+        for transaction in transactions:
+            matches = existing.get((transaction["account"].pk, transaction["amount"].amount > 0), [])
+            foreign_amount = transaction.get("foreign_amount", None)
+
+            if len(matches) == 0:
+                self.transactions.create(account=transaction["account"], amount=transaction["amount"], foreign_amount=foreign_amount, date=self.date)
+                continue
+
+            leg = matches.pop(0)
+            if leg.amount != transaction["amount"] or leg.foreign_amount != foreign_amount:
+                leg.amount = transaction["amount"]
+                leg.foreign_amount = foreign_amount
+                leg.save(update_fields=["amount", "amount_currency", "foreign_amount", "foreign_amount_currency", "modified"])
+
+        for legs in existing.values():
+            for leg in legs:
+                leg.delete()
 
     def update_accounts(self):
-        source_accounts = self.get_source_accounts()
-        destination_accounts = self.get_destination_accounts()
+        """Recomputes ``source_accounts``, ``destination_accounts`` and ``amount`` from the stored legs (read in one query) and saves them."""
+        self._update_accounts_from_transactions(
+            transactions=[
+                {"account": transaction.account, "amount": transaction.amount}
+                for transaction in self.transactions.select_related("account").order_by("id")
+            ]
+        )
 
-        self.source_accounts = [
-            {"account": account.name, "slug": account.slug, "type": account.get_type_display(), "link_type": account.type, "icon": account.icon}
-            for account in source_accounts
-        ]
-        self.destination_accounts = [
-            {"account": account.name, "slug": account.slug, "type": account.get_type_display(), "link_type": account.type, "icon": account.icon}
-            for account in destination_accounts
-        ]
+        self.save(update_fields=["source_accounts", "destination_accounts", "amount", "amount_currency", "modified"])
+
+    def _update_fingerprint(self, transactions, occurrence=0):
+        """Sets ``fingerprint`` from the journal and its legs (in the ``create`` format). Imported journals keep the fingerprint
+        they were imported with, so importing the same statement again still skips them after they were edited."""
+        if self.imported and self.fingerprint is not None:
+            return
+
+        self.fingerprint = get_fingerprint(
+            self.date,
+            self.short_description,
+            [
+                (
+                    transaction["account"].pk if transaction["account"] is not None else None,
+                    transaction["amount"].amount,
+                    transaction["amount"].currency,
+                )
+                for transaction in transactions
+            ],
+            occurrence=occurrence,
+        )
+
+    def _update_accounts_from_transactions(self, transactions):
+        """Sets ``source_accounts``, ``destination_accounts`` and ``amount`` from transactions in the ``create`` format."""
 
-        self.amount = self.transactions.first().amount
+        def serialize_accounts(accounts):
+            accounts = sorted({account.pk: account for account in accounts if account is not None}.values(), key=lambda account: account.name)
+
+            return [
+                {"account": account.name, "slug": account.slug, "type": account.get_type_display(), "link_type": account.type, "icon": account.icon}
+                for account in accounts
+            ]
+
+        self.source_accounts = serialize_accounts([transaction["account"] for transaction in transactions if transaction["amount"].amount <= 0])
+        self.destination_accounts = serialize_accounts([transaction["account"] for transaction in transactions if transaction["amount"].amount >= 0])
+
+        if len(transactions) == 0:
+            return
+
+        self.amount = transactions[0]["amount"]
         if self.type == self.TransactionType.WITHDRAWAL:
-            self.amount = self.transactions.get(amount__lte=0).amount
-        if self.type == self.TransactionType.DEPOSIT or type == self.TransactionType.TRANSFER:
-            self.amount = self.transactions.get(amount__gte=0).amount
+            self.amount = next((transaction["amount"] for transaction in transactions if transaction["amount"].amount <= 0), self.amount)
+        if self.type in [self.TransactionType.DEPOSIT, self.TransactionType.TRANSFER]:
+            self.amount = next((transaction["amount"] for transaction in transactions if transaction["amount"].amount >= 0), self.amount)
 
         if self.type == self.TransactionType.TRANSFER:
             self.amount = abs(self.amount)
 
-        self.save()
-
     def get_source_accounts(self):
         accounts = Account.objects.filter(transactions__journal=self, transactions__amount__lte=0).distinct()
 
@@ -194,9 +619,19 @@ class Transaction(models.Model):
     )
     uuid = models.UUIDField("UUID", default=uuid.uuid4, editable=False, db_index=True, unique=True)
     journal = models.ForeignKey(TransactionJournal, on_delete=models.CASCADE, related_name="transactions")
+    date = models.DateField(default=timezone.localdate, help_text="Copy of the journal date, kept in sync by the journal.")
 
     created = models.DateTimeField(auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
 
+    tracker = FieldTracker(fields=["account"])
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["account", "date"], name="transaction_account_date"),
+            models.Index(fields=["amount_currency", "date"], name="transaction_currency_date"),
+            models.Index(fields=["modified"], name="transaction_modified"),
+        ]
+
     def __str__(self):
-        return self.journal.short_description
\ No newline at end of file
+        return self.journal.short_description
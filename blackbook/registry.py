@@ -0,0 +1,126 @@
+from collections import namedtuple
+
+from .cache import get_generation, bump_generation
+from .models import Account
+
+import bisect
+import re
+
+ACCOUNT_REGEX = re.compile(r"(.*)\s-\s(.*)")
+
+ACCOUNT_FIELDS = ["id", "name", "slug", "type", "currency", "active"]
+AccountEntry = namedtuple("AccountEntry", ACCOUNT_FIELDS + ["label"])
+
+_account_registry = None
+
+
+def get_account_label(type, name):
+    return "{type} - {name}".format(type=Account.AccountType(type).label, name=name)
+
+
+def parse_account_label(label, default_type=Account.AccountType.REVENUE_ACCOUNT):
+    """Splits a "Type - Name" label into its account type and name, ``default_type`` is used when the label holds no known type."""
+    match = ACCOUNT_REGEX.match(label)
+
+    if match is None:
+        return default_type, label
+
+    for account_type in Account.AccountType:
+        if account_type.label == match[1]:
+            return account_type, match[2]
+
+    return default_type, match[2]
+
+
+class AccountRegistry:
+    """In-process index of all accounts by id, slug and (type, name), used to resolve and list "Type - Name" labels
+    without querying the database.
+
+    The registry is loaded once per process and reloaded when the "accounts" generation moves on (bumped by the
+    Account save and delete signals), use ``get_account_registry`` to get the current one. Accounts missing from the
+    registry (created by another process before it saw the new generation) are looked up in the database."""
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.by_id = {}
+        self.by_slug = {}
+        self.by_name = {}
+
+        for account in Account.objects.order_by("type", "name").values(*ACCOUNT_FIELDS):
+            self._add(account)
+
+        # Lowercased labels and names (with the account id) in sorted order, ``search`` bisects to the first match
+        self.search_keys = sorted(key for entry in self.by_id.values() for key in self._get_search_keys(entry))
+
+    def _add(self, account):
+        entry = AccountEntry(label=get_account_label(account["type"], account["name"]), **account)
+
+        self.by_id[entry.id] = entry
+        self.by_slug[entry.slug] = entry
+        self.by_name[(entry.type, entry.name)] = entry
+
+        return entry
+
+    def _get_search_keys(self, entry):
+        return [(entry.label.lower(), entry.id), (entry.name.lower(), entry.id)]
+
+    def _load(self, **filters):
+        account = Account.objects.filter(**filters).values(*ACCOUNT_FIELDS).first()
+
+        if account is None:
+            return None
+
+        entry = self._add(account)
+        for key in self._get_search_keys(entry):
+            bisect.insort(self.search_keys, key)
+
+        return entry
+
+    def get(self, label, default_type=Account.AccountType.REVENUE_ACCOUNT):
+        """Returns the entry for a "Type - Name" label (or plain name of an account of ``default_type``), None if unknown."""
+        account_type, name = parse_account_label(label, default_type=default_type)
+
+        return self.by_name.get((account_type, name), None) or self._load(type=account_type, name=name)
+
+    def get_by_slug(self, slug):
+        return self.by_slug.get(slug, None) or self._load(slug=slug)
+
+    def search(self, query, limit=10, active=True):
+        """Returns up to ``limit`` labels of which the label itself or the account name starts with ``query`` (ignoring case),
+        in alphabetical order of the matching text."""
+        query = query.lower()
+        labels = []
+        seen = set()
+
+        for index in range(bisect.bisect_left(self.search_keys, (query,)), len(self.search_keys)):
+            key, account_id = self.search_keys[index]
+
+            if len(labels) >= limit or not key.startswith(query):
+                break
+
+            entry = self.by_id[account_id]
+            # Keys of an account loaded again after a rename are left behind, only the current label and name count
+            if account_id in seen or (active and not entry.active) or key not in (entry.label.lower(), entry.name.lower()):
+                continue
+
+            seen.add(account_id)
+            labels.append(entry.label)
+
+        return labels
+
+
+def get_account_registry():
+    global _account_registry
+
+    generation = get_generation("accounts")
+    if _account_registry is None or _account_registry.generation != generation:
+        _account_registry = AccountRegistry(generation=generation)
+
+    return _account_registry
+
+
+def invalidate_account_registry():
+    global _account_registry
+
+    _account_registry = None
+    bump_generation("accounts")
@@ -0,0 +1,232 @@
+from django.db.models import Q
+from django.utils import timezone
+
+from collections import deque, namedtuple
+
+from .cache import get_generation, bump_generation
+from .models import CategorizationRule, BudgetPeriod, Budget, Category, Transaction, TransactionJournal
+
+RuleEntry = namedtuple("RuleEntry", ["id", "min_amount", "max_amount", "account_id", "category_id", "budget_id"])
+
+_rule_engine = None
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton over a list of patterns: ``search`` returns the indexes of all patterns occurring in a text
+    in a single pass over the text, however many patterns there are."""
+
+    def __init__(self, patterns):
+        self.transitions = [{}]
+        self.fallbacks = [0]
+        self.outputs = [[]]
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+
+            for character in pattern:
+                if character not in self.transitions[state]:
+                    self.transitions.append({})
+                    self.fallbacks.append(0)
+                    self.outputs.append([])
+                    self.transitions[state][character] = len(self.transitions) - 1
+
+                state = self.transitions[state][character]
+
+            self.outputs[state].append(index)
+
+        # Breadth first, so the fallback of a state (always less deep) is complete before the state itself is handled
+        queue = deque(self.transitions[0].values())
+        while len(queue) > 0:
+            state = queue.popleft()
+
+            for character, next_state in self.transitions[state].items():
+                fallback = self.fallbacks[state]
+                while fallback != 0 and character not in self.transitions[fallback]:
+                    fallback = self.fallbacks[fallback]
+
+                self.fallbacks[next_state] = self.transitions[fallback].get(character, 0)
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fallbacks[next_state]]
+
+                queue.append(next_state)
+
+    def search(self, text):
+        state = 0
+        found = set()
+
+        for character in text:
+            while state != 0 and character not in self.transitions[state]:
+                state = self.fallbacks[state]
+
+            state = self.transitions[state].get(character, 0)
+            found.update(self.outputs[state])
+
+        return found
+
+
+class RuleEngine:
+    """All active categorization rules compiled into one ``PatternMatcher``, loaded once per process and reloaded when the
+    "rules" generation moves on (bumped by the rule save and delete signals), use ``get_rule_engine`` to get the current one."""
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.rules = []
+        self.unconditional = []
+        pattern_indexes = {}
+        self.pattern_rules = []
+
+        rules = (
+            CategorizationRule.objects.filter(active=True)
+            .filter(Q(category__isnull=False) | Q(budget__isnull=False))
+            .order_by("priority", "id")
+            .values("id", "pattern", "min_amount", "max_amount", "account_id", "category_id", "budget_id")
+        )
+
+        for index, rule in enumerate(rules):
+            pattern = rule.pop("pattern").lower()
+            self.rules.append(RuleEntry(**rule))
+
+            if pattern == "":
+                self.unconditional.append(index)
+                continue
+
+            if pattern not in pattern_indexes:
+                pattern_indexes[pattern] = len(self.pattern_rules)
+                self.pattern_rules.append([])
+
+            self.pattern_rules[pattern_indexes[pattern]].append(index)
+
+        self.matcher = PatternMatcher(list(pattern_indexes.keys()))
+
+    def match(self, description, amount=None, account_ids=()):
+        """Returns the first rule (by priority) matching the description, absolute amount and accounts, None if none does."""
+        candidates = set(self.unconditional)
+        for pattern_index in self.matcher.search(description.lower()):
+            candidates.update(self.pattern_rules[pattern_index])
+
+        for index in sorted(candidates):
+            rule = self.rules[index]
+
+            if rule.account_id is not None and rule.account_id not in account_ids:
+                continue
+
+            if rule.min_amount is not None and (amount is None or amount < rule.min_amount):
+                continue
+
+            if rule.max_amount is not None and (amount is None or amount > rule.max_amount):
+                continue
+
+            return rule
+
+        return None
+
+
+def get_rule_engine():
+    global _rule_engine
+
+    generation = get_generation("rules")
+    if _rule_engine is None or _rule_engine.generation != generation:
+        _rule_engine = RuleEngine(generation=generation)
+
+    return _rule_engine
+
+
+def invalidate_rule_engine():
+    global _rule_engine
+
+    _rule_engine = None
+    bump_generation("rules")
+
+
+def get_budget_period(budget_id, date, budget_periods):
+    """Returns the id of the period of a budget covering ``date`` (or today), ``budget_periods`` caches the periods per budget."""
+    if budget_id not in budget_periods:
+        budget_periods[budget_id] = list(BudgetPeriod.objects.filter(budget_id=budget_id).values_list("id", "start_date", "end_date"))
+
+    for check_date in [date, timezone.localdate()]:
+        for period_id, start_date, end_date in budget_periods[budget_id]:
+            if start_date <= check_date <= end_date:
+                return period_id
+
+    return None
+
+
+def get_journal_text(short_description, description):
+    return "{short_description} {description}".format(short_description=short_description, description=description or "")
+
+
+def apply_rules(journal, transactions, budget_periods=None):
+    """Fills in the missing category and budget of an unsaved ``journal`` (with its legs in the ``create`` format) from the
+    first matching rule, returns that rule or None."""
+    if journal.type in [TransactionJournal.TransactionType.START, TransactionJournal.TransactionType.RECONCILIATION]:
+        return None
+
+    if journal.category_id is not None and journal.budget_id is not None:
+        return None
+
+    rule = get_rule_engine().match(
+        get_journal_text(journal.short_description, journal.description),
+        amount=abs(journal.amount.amount),
+        account_ids={transaction["account"].pk for transaction in transactions},
+    )
+
+    if rule is not None:
+        if journal.category_id is None and rule.category_id is not None:
+            journal.category_id = rule.category_id
+
+        if journal.budget_id is None and rule.budget_id is not None:
+            journal.budget_id = get_budget_period(rule.budget_id, journal.date, budget_periods if budget_periods is not None else {})
+
+    return rule
+
+
+def apply_rules_to_journals(transaction_journals, overwrite=False, chunk_size=1000):
+    """Runs the rules over existing journals, filling in missing categories and budgets (or replacing them all with
+    ``overwrite``). Journals are matched in chunks and changed with one ``TransactionJournal.bulk_edit`` per category and
+    budget. Returns the number of journals changed."""
+    engine = get_rule_engine()
+    changes = {"category": {}, "budget": {}}
+    changed = set()
+
+    transaction_journals = transaction_journals.exclude(
+        type__in=[TransactionJournal.TransactionType.START, TransactionJournal.TransactionType.RECONCILIATION]
+    )
+    if not overwrite:
+        transaction_journals = transaction_journals.filter(Q(category=None) | Q(budget=None))
+
+    journal_ids = list(transaction_journals.order_by("id").values_list("id", flat=True))
+
+    for index in range(0, len(journal_ids), chunk_size):
+        chunk = journal_ids[index : index + chunk_size]
+
+        account_ids = {}
+        for journal_id, account_id in Transaction.objects.filter(journal_id__in=chunk).values_list("journal_id", "account_id"):
+            account_ids.setdefault(journal_id, set()).add(account_id)
+
+        for journal in TransactionJournal.objects.filter(id__in=chunk).values(
+            "id", "short_description", "description", "amount", "category_id", "budget_id"
+        ):
+            rule = engine.match(
+                get_journal_text(journal["short_description"], journal["description"]),
+                amount=abs(journal["amount"]),
+                account_ids=account_ids.get(journal["id"], set()),
+            )
+
+            if rule is None:
+                continue
+
+            for field in ["category", "budget"]:
+                value = getattr(rule, field + "_id")
+
+                if value is not None and (overwrite or journal[field + "_id"] is None):
+                    changes[field].setdefault(value, []).append(journal["id"])
+                    changed.add(journal["id"])
+
+    categories = Category.objects.in_bulk(changes["category"].keys())
+    for category_id, ids in changes["category"].items():
+        TransactionJournal.bulk_edit(TransactionJournal.objects.filter(id__in=ids), {"category": categories[category_id]})
+
+    budgets = Budget.objects.in_bulk(changes["budget"].keys())
+    for budget_id, ids in changes["budget"].items():
+        TransactionJournal.bulk_edit(TransactionJournal.objects.filter(id__in=ids), {"budget": budgets[budget_id]})
+
+    return len(changed)
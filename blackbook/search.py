@@ -0,0 +1,157 @@
+from django.conf import settings
+from django.db import connection, OperationalError
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+import re
+
+SEARCH_TABLE = "blackbook_transactionjournal_search"
+SEARCH_COLUMN = "search_vector"
+TOKEN_REGEX = re.compile(r"\w+", re.UNICODE)
+
+
+def get_search_tokens(query):
+    return TOKEN_REGEX.findall(query or "")
+
+
+class SearchBackend:
+    """Searches the short description and description of transaction journals.
+
+    ``index`` and ``remove`` are called (through signals and bulk inserts) whenever journals change, ``rebuild`` recreates
+    the full index. ``filter`` narrows a queryset of journals down to the ones matching every word of ``query`` (as a
+    prefix), the ordering of the queryset is kept (the transactions list pages through it by date)."""
+
+    def index(self, journals):
+        pass
+
+    def remove(self, journals):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def filter(self, queryset, query):
+        raise NotImplementedError
+
+
+class IContainsSearchBackend(SearchBackend):
+    """Fallback without an index, every word has to appear somewhere in the short description or description."""
+
+    def filter(self, queryset, query):
+        for token in get_search_tokens(query):
+            queryset = queryset.filter(Q(short_description__icontains=token) | Q(description__icontains=token))
+
+        return queryset
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """Keeps an FTS5 table (rowid = journal id) in sync with the journals."""
+
+    CHUNK_SIZE = 300
+
+    def _match(self, query):
+        return " ".join('"{token}"*'.format(token=token) for token in get_search_tokens(query))
+
+    def _chunks(self, journals):
+        # Single statements (no executemany, which not every cursor wrapper supports), kept below SQLite's 999 parameters
+        journals = list(journals)
+
+        for start in range(0, len(journals), self.CHUNK_SIZE):
+            yield journals[start : start + self.CHUNK_SIZE]
+
+    def index(self, journals):
+        with connection.cursor() as cursor:
+            for chunk in self._chunks(journals):
+                cursor.execute(
+                    "INSERT OR REPLACE INTO {table} (rowid, short_description, description) VALUES {values}".format(
+                        table=SEARCH_TABLE, values=", ".join(["(%s, %s, %s)"] * len(chunk))
+                    ),
+                    [value for journal in chunk for value in (journal.pk, journal.short_description, journal.description or "")],
+                )
+
+    def remove(self, journals):
+        with connection.cursor() as cursor:
+            for chunk in self._chunks(journals):
+                cursor.execute(
+                    "DELETE FROM {table} WHERE rowid IN ({ids})".format(table=SEARCH_TABLE, ids=", ".join(["%s"] * len(chunk))),
+                    [journal.pk for journal in chunk],
+                )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM {table}".format(table=SEARCH_TABLE))
+            cursor.execute(
+                "INSERT INTO {table} (rowid, short_description, description) "
+                "SELECT id, short_description, COALESCE(description, '') FROM blackbook_transactionjournal".format(table=SEARCH_TABLE)
+            )
+
+    def filter(self, queryset, query):
+        match = self._match(query)
+        if match == "":
+            return queryset
+
+        queryset = queryset.filter(id__in=RawSQL("SELECT rowid FROM {table} WHERE {table} MATCH %s".format(table=SEARCH_TABLE), [match]))
+
+        return queryset
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """Uses the tsvector column (kept up to date by a trigger) and its GIN index on the journal table."""
+
+    def _match(self, query):
+        return " & ".join("{token}:*".format(token=token) for token in get_search_tokens(query))
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE blackbook_transactionjournal SET {column} = "
+                "to_tsvector('pg_catalog.simple', COALESCE(short_description, '') || ' ' || COALESCE(description, ''))".format(column=SEARCH_COLUMN)
+            )
+
+    def filter(self, queryset, query):
+        match = self._match(query)
+        if match == "":
+            return queryset
+
+        queryset = queryset.filter(
+            id__in=RawSQL(
+                "SELECT id FROM blackbook_transactionjournal WHERE {column} @@ to_tsquery('pg_catalog.simple', %s)".format(column=SEARCH_COLUMN),
+                [match],
+            )
+        )
+
+        return queryset
+
+
+_search_backend = None
+
+
+def _has_sqlite_index():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s", [SEARCH_TABLE])
+
+            return cursor.fetchone() is not None
+    except OperationalError:
+        return False
+
+
+def get_search_backend():
+    """Returns the backend set in BLACKBOOK_SEARCH_BACKEND (a dotted path) or the one matching the database in use."""
+    global _search_backend
+
+    if _search_backend is None:
+        backend = getattr(settings, "BLACKBOOK_SEARCH_BACKEND", None)
+
+        if backend is None:
+            if connection.vendor == "postgresql":
+                backend = "blackbook.search.PostgreSQLSearchBackend"
+            elif connection.vendor == "sqlite" and _has_sqlite_index():
+                backend = "blackbook.search.SQLiteSearchBackend"
+            else:
+                backend = "blackbook.search.IContainsSearchBackend"
+
+        _search_backend = import_string(backend)()
+
+    return _search_backend
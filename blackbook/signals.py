@@ -1,13 +1,31 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.conf import settings
+from django.db import transaction as db_transaction
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 from datetime import timedelta, date
 
-from .models import UserProfile, Budget, BudgetPeriod, PayCheckItem
+from .models import (
+    UserProfile,
+    Budget,
+    BudgetPeriod,
+    Category,
+    PayCheckItem,
+    Account,
+    AccountBalance,
+    NetWorthSnapshot,
+    Transaction,
+    TransactionJournal,
+    CategorizationRule,
+)
 from .utilities import calculate_period
+from .cache import bump_generation
+from .search import get_search_backend
+from .registry import invalidate_account_registry
+from .rules import invalidate_rule_engine
+from .concurrency import lock_rows, retry_on_conflict
 
 
 @receiver(post_save, sender=PayCheckItem)
@@ -26,6 +44,7 @@ def create_userprofile(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=Budget)
+@retry_on_conflict
 def create_budget_period(sender, instance, created, **kwargs):
     current_date = timezone.localdate()
     period = {"start_date": current_date, "end_date": date(9999, 12, 31)}
@@ -33,11 +52,15 @@ def create_budget_period(sender, instance, created, **kwargs):
     if instance.auto_budget != Budget.AutoBudget.NO:
         period = calculate_period(periodicity=instance.auto_budget_period, start_date=current_date)
 
-    if created:
-        instance.periods.create(start_date=period["start_date"], end_date=period["end_date"], amount=instance.amount)
+    with db_transaction.atomic():
+        if created:
+            instance.periods.create(start_date=period["start_date"], end_date=period["end_date"], amount=instance.amount)
+            return
 
-    else:
-        current_period = instance.current_period
+        # Lock the periods of this budget and re-read the current one, so concurrent saves do not overwrite each other's amounts
+        lock_rows(BudgetPeriod.objects.filter(budget=instance))
+        current_period = instance.get_period_for_date(current_date)
+        instance.__dict__.pop("current_period", None)
 
         if current_period is not None:
             old_amount = instance.amount
@@ -59,5 +82,102 @@ def create_budget_period(sender, instance, created, **kwargs):
 
                 instance.periods.create(start_date=current_date, end_date=period["end_date"], amount=amount)
 
-        if instance.current_period is None:
-            instance.periods.create(start_date=period["start_date"], end_date=period["end_date"], amount=instance.amount)
\ No newline at end of file
+        else:
+            instance.periods.create(start_date=period["start_date"], end_date=period["end_date"], amount=instance.amount)
+
+
+def _in_net_worth(*accounts):
+    return any(account is not None and account.active and account.net_worth for account in accounts)
+
+
+@receiver(post_save, sender=Transaction)
+def update_account_balances(sender, instance, created, **kwargs):
+    previous_account = None
+
+    if instance.account is not None:
+        AccountBalance.update_for_account(account=instance.account, from_date=instance.date)
+
+    if not created and instance.tracker.has_changed("account") and instance.tracker.previous("account") is not None:
+        previous_account = Account.objects.filter(pk=instance.tracker.previous("account")).first()
+
+        if previous_account is not None:
+            AccountBalance.update_for_account(account=previous_account, from_date=instance.date)
+
+    if _in_net_worth(instance.account, previous_account):
+        NetWorthSnapshot.schedule_update(from_date=instance.date)
+
+
+@receiver(post_delete, sender=Transaction)
+def remove_account_balances(sender, instance, **kwargs):
+    if instance.account_id is None:
+        return
+
+    account = Account.objects.filter(pk=instance.account_id).first()
+
+    if account is not None:
+        AccountBalance.update_for_account(account=account, from_date=instance.date)
+
+    if _in_net_worth(account):
+        NetWorthSnapshot.schedule_update(from_date=instance.date)
+
+
+@receiver(post_save, sender=TransactionJournal)
+def update_journal_account_balances(sender, instance, created, **kwargs):
+    if created or not instance.tracker.has_changed("date"):
+        return
+
+    from_date = min(instance.date, instance.tracker.previous("date"))
+    instance.transactions.update(date=instance.date)
+
+    accounts = list(Account.objects.filter(transactions__journal=instance).distinct())
+    for account in accounts:
+        AccountBalance.update_for_account(account=account, from_date=from_date)
+
+    if _in_net_worth(*accounts):
+        NetWorthSnapshot.schedule_update(from_date=from_date)
+
+
+@receiver(post_save, sender=TransactionJournal)
+def index_journal(sender, instance, **kwargs):
+    get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=TransactionJournal)
+def remove_journal_from_index(sender, instance, **kwargs):
+    get_search_backend().remove([instance])
+
+
+@receiver(post_save, sender=Account)
+def update_net_worth(sender, instance, created, **kwargs):
+    if created and instance.virtual_balance == 0:
+        return
+
+    if created or instance.tracker.changed():
+        NetWorthSnapshot.schedule_update()
+
+
+@receiver(post_delete, sender=Account)
+def remove_net_worth(sender, instance, **kwargs):
+    NetWorthSnapshot.schedule_update()
+
+
+@receiver([post_save, post_delete], sender=Account)
+def invalidate_accounts(sender, instance, **kwargs):
+    db_transaction.on_commit(invalidate_account_registry)
+
+
+@receiver([post_save, post_delete], sender=CategorizationRule)
+def invalidate_rules(sender, instance, **kwargs):
+    db_transaction.on_commit(invalidate_rule_engine)
+
+
+@receiver([post_save, post_delete], sender=Transaction)
+@receiver([post_save, post_delete], sender=TransactionJournal)
+@receiver([post_save, post_delete], sender=Account)
+@receiver([post_save, post_delete], sender=Budget)
+@receiver([post_save, post_delete], sender=BudgetPeriod)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_dashboard(sender, instance, **kwargs):
+    # Bumped once committed, a request reading in between would otherwise cache the old data under the new generation
+    db_transaction.on_commit(lambda: bump_generation("dashboard"))
@@ -0,0 +1,58 @@
+/*
+ * Fills the datalist of inputs carrying a data-autocomplete-url attribute with the suggestions returned by that
+ * endpoint ({"results": [...]}) for the text typed so far. Requests are debounced and answers are kept per query.
+ */
+(function () {
+    "use strict";
+
+    var DELAY = 150;
+
+    function fillDataList(dataList, results) {
+        dataList.replaceChildren.apply(dataList, results.map(function (result) {
+            var option = document.createElement("option");
+            option.value = result;
+
+            return option;
+        }));
+    }
+
+    function attach(input) {
+        var dataList = document.getElementById(input.getAttribute("list"));
+        var url = input.getAttribute("data-autocomplete-url");
+        var answers = {};
+        var timer = null;
+
+        if (dataList === null || url === null) {
+            return;
+        }
+
+        function update() {
+            var query = input.value;
+
+            if (query in answers) {
+                fillDataList(dataList, answers[query]);
+                return;
+            }
+
+            fetch(url + "?q=" + encodeURIComponent(query), {credentials: "same-origin", headers: {"Accept": "application/json"}})
+                .then(function (response) {
+                    return response.ok ? response.json() : {results: []};
+                })
+                .then(function (data) {
+                    answers[query] = data.results;
+
+                    if (input.value === query) {
+                        fillDataList(dataList, data.results);
+                    }
+                });
+        }
+
+        input.addEventListener("input", function () {
+            clearTimeout(timer);
+            timer = setTimeout(update, DELAY);
+        });
+        input.addEventListener("focus", update, {once: true});
+    }
+
+    document.querySelectorAll("input[data-autocomplete-url]").forEach(attach);
+})();
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.test import TestCase
+
+from djmoney.money import Money
+from datetime import date
+from unittest import mock
+
+from .. import models
+
+
+class NetWorthSnapshotTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.bank = models.Account.objects.create(name="Bank", type=models.Account.AccountType.ASSET_ACCOUNT, currency="EUR")
+        cls.savings = models.Account.objects.create(name="Savings", type=models.Account.AccountType.ASSET_ACCOUNT, currency="EUR")
+        cls.shop = models.Account.objects.create(name="Shop", type=models.Account.AccountType.EXPENSE_ACCOUNT, currency="EUR", net_worth=False)
+        cls.employer = models.Account.objects.create(
+            name="Employer", type=models.Account.AccountType.REVENUE_ACCOUNT, currency="EUR", net_worth=False
+        )
+
+    def create_journal(self, day, source, destination, amount=10):
+        return models.TransactionJournal.create(
+            {
+                "short_description": "Journal {day}".format(day=day),
+                "date": date(2021, 1, day),
+                "type": models.TransactionJournal.TransactionType.TRANSFER,
+                "transactions": [{"account": source, "amount": Money(-amount, "EUR")}, {"account": destination, "amount": Money(amount, "EUR")}],
+            }
+        )
+
+    def test_single_update_per_transaction(self):
+        with mock.patch.object(models.NetWorthSnapshot, "update_from_date", wraps=models.NetWorthSnapshot.update_from_date) as update:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    self.create_journal(5, self.employer, self.bank, amount=100)
+                    self.create_journal(3, self.bank, self.savings)
+
+        update.assert_called_once_with(from_date=date(2021, 1, 3))
+        self.assertEqual(models.NetWorthSnapshot.get_net_worth("EUR", date(2021, 1, 4)), Money(0, "EUR"))
+        self.assertEqual(models.NetWorthSnapshot.get_net_worth("EUR", date(2021, 1, 5)), Money(100, "EUR"))
+
+    def test_no_update_outside_net_worth(self):
+        with mock.patch.object(models.NetWorthSnapshot, "update_from_date") as update:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.create_journal(1, self.employer, self.shop)
+
+        update.assert_not_called()
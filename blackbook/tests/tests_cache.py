@@ -0,0 +1,19 @@
+from django.test import TestCase
+
+from .. import models
+from ..cache import get_generation
+
+
+class InvalidationTest(TestCase):
+    def test_bumped_on_commit(self):
+        generations = {name: get_generation(name) for name in ["dashboard", "accounts", "rules"]}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            account = models.Account.objects.create(name="Bank", type=models.Account.AccountType.ASSET_ACCOUNT, currency="EUR")
+            models.CategorizationRule.objects.create(name="Groceries", pattern="groceries", account=account)
+
+            for name, generation in generations.items():
+                self.assertEqual(get_generation(name), generation)
+
+        for name, generation in generations.items():
+            self.assertNotEqual(get_generation(name), generation)
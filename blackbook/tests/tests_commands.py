@@ -0,0 +1,86 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from djmoney.money import Money
+from datetime import date
+from io import StringIO
+
+import os
+import tempfile
+
+from .. import models
+
+
+class RebuildJournalCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.bank = models.Account.objects.create(name="Bank", type=models.Account.AccountType.ASSET_ACCOUNT, currency="EUR")
+        cls.shop = models.Account.objects.create(name="Shop", type=models.Account.AccountType.EXPENSE_ACCOUNT, currency="EUR")
+
+        for day in range(1, 6):
+            models.TransactionJournal.create(
+                {
+                    "short_description": "Groceries {day}".format(day=day),
+                    "date": date(2021, 1, day),
+                    "type": models.TransactionJournal.TransactionType.WITHDRAWAL,
+                    "transactions": [{"account": cls.bank, "amount": Money(-10, "EUR")}, {"account": cls.shop, "amount": Money(10, "EUR")}],
+                }
+            )
+
+    def test_rebuild_over_several_chunks(self):
+        fingerprints = dict(models.TransactionJournal.objects.values_list("id", "fingerprint"))
+        models.TransactionJournal.objects.update(source_accounts=None, destination_accounts=None, fingerprint=None)
+
+        call_command("rebuild_journal_cache", chunk_size=2, stdout=StringIO())
+
+        self.assertEqual(dict(models.TransactionJournal.objects.values_list("id", "fingerprint")), fingerprints)
+        for journal in models.TransactionJournal.objects.all():
+            self.assertEqual([account["account"] for account in journal.source_accounts], ["Bank"])
+            self.assertEqual([account["account"] for account in journal.destination_accounts], ["Shop"])
+
+    def test_rebuild_with_deleted_account(self):
+        models.Transaction.objects.filter(account=self.shop).update(account=None)
+
+        call_command("rebuild_journal_cache", stdout=StringIO())
+
+        for journal in models.TransactionJournal.objects.all():
+            self.assertEqual(journal.destination_accounts, [])
+            self.assertIsNotNone(journal.fingerprint)
+
+
+class ImportStatementTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.bank = models.Account.objects.create(name="Bank", type=models.Account.AccountType.ASSET_ACCOUNT, currency="EUR")
+
+    def import_statement(self, rows, **options):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as statement:
+            statement.write("date,amount,description,counterparty\n")
+            statement.writelines("{0},{1},{2},{3}\n".format(*row) for row in rows)
+
+        self.addCleanup(os.remove, statement.name)
+        call_command("import_statement", statement.name, self.bank.slug, stdout=StringIO(), **options)
+
+    def test_snapshots_refreshed_after_failed_row(self):
+        rows = [("2021-01-0{day}".format(day=day), "-10", "Coffee", "Cafe") for day in range(1, 4)] + [("2021-01-04", "ten", "Coffee", "Cafe")]
+
+        with self.assertRaises(CommandError):
+            self.import_statement(rows, batch_size=2)
+
+        self.assertEqual(models.TransactionJournal.objects.count(), 2)
+        self.assertEqual(models.AccountBalance.get_balance(self.bank, date(2021, 1, 31)), Money(-20, "EUR"))
+
+    def test_identical_rows_on_a_day(self):
+        rows = [("2021-01-01", "-3", "Coffee", "Cafe"), ("2021-01-01", "-3", "Coffee", "Cafe"), ("2021-01-02", "-3", "Coffee", "Cafe")]
+
+        self.import_statement(rows)
+        self.import_statement(rows)
+
+        self.assertEqual(models.TransactionJournal.objects.count(), 3)
+
+    def test_rows_not_ordered_by_date(self):
+        rows = [("2021-01-01", "-3", "Coffee", "Cafe"), ("2021-01-02", "-3", "Coffee", "Cafe"), ("2021-01-01", "-3", "Coffee", "Cafe")]
+
+        with self.assertRaises(CommandError):
+            self.import_statement(rows)
@@ -0,0 +1,32 @@
+from django.test import TestCase
+
+from .. import models
+from ..registry import AccountRegistry
+
+
+class AccountRegistryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for name, account_type, active in [
+            ("Bank", models.Account.AccountType.ASSET_ACCOUNT, True),
+            ("Bakery", models.Account.AccountType.EXPENSE_ACCOUNT, True),
+            ("Barber", models.Account.AccountType.EXPENSE_ACCOUNT, False),
+            ("Employer", models.Account.AccountType.REVENUE_ACCOUNT, True),
+        ]:
+            models.Account.objects.create(name=name, type=account_type, currency="EUR", active=active)
+
+    def test_search(self):
+        registry = AccountRegistry(generation=0)
+
+        self.assertEqual(registry.search("ba"), ["Expense Account - Bakery", "Asset Account - Bank"])
+        self.assertEqual(registry.search("BA", active=False), ["Expense Account - Bakery", "Asset Account - Bank", "Expense Account - Barber"])
+        self.assertEqual(registry.search("expense account - b", limit=1), ["Expense Account - Bakery"])
+        self.assertEqual(registry.search("ba", limit=1), ["Expense Account - Bakery"])
+        self.assertEqual(registry.search("x"), [])
+
+    def test_search_loaded_account(self):
+        registry = AccountRegistry(generation=0)
+        models.Account.objects.create(name="Bar", type=models.Account.AccountType.EXPENSE_ACCOUNT, currency="EUR")
+
+        self.assertIsNotNone(registry.get("Expense Account - Bar"))
+        self.assertEqual(registry.search("bar"), ["Expense Account - Bar"])
@@ -0,0 +1,46 @@
+from django.test import TestCase
+
+from djmoney.money import Money
+from datetime import date
+
+from .. import models
+from ..search import SQLiteSearchBackend
+
+
+class SQLiteSearchBackendTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        bank = models.Account.objects.create(name="Bank", type=models.Account.AccountType.ASSET_ACCOUNT, currency="EUR")
+        shop = models.Account.objects.create(name="Shop", type=models.Account.AccountType.EXPENSE_ACCOUNT, currency="EUR")
+
+        for day in range(1, 6):
+            models.TransactionJournal.create(
+                {
+                    "short_description": "Groceries {day}".format(day=day) if day % 2 else "Rent {day}".format(day=day),
+                    "date": date(2021, 1, day),
+                    "type": models.TransactionJournal.TransactionType.WITHDRAWAL,
+                    "transactions": [{"account": bank, "amount": Money(-10, "EUR")}, {"account": shop, "amount": Money(10, "EUR")}],
+                }
+            )
+
+    def setUp(self):
+        self.backend = SQLiteSearchBackend()
+        self.backend.CHUNK_SIZE = 2
+
+    def search(self, query):
+        return sorted(self.backend.filter(models.TransactionJournal.objects.all(), query).values_list("short_description", flat=True))
+
+    def test_index_over_several_chunks(self):
+        self.backend.rebuild()
+        models.TransactionJournal.objects.update(short_description="Taxes")
+        self.backend.index(models.TransactionJournal.objects.all())
+
+        self.assertEqual(self.search("groc"), [])
+        self.assertEqual(len(self.search("tax")), 5)
+
+    def test_remove_over_several_chunks(self):
+        self.backend.rebuild()
+        self.backend.remove(models.TransactionJournal.objects.filter(short_description__startswith="Groceries"))
+
+        self.assertEqual(self.search("groc"), [])
+        self.assertEqual(self.search("rent"), ["Rent 2", "Rent 4"])
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from djmoney.money import Money
+from datetime import date
+
+from .. import models
+
+
+@override_settings(INTERNAL_IPS=[])
+class AccountDeleteTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="user", password="password")
+        cls.bank = models.Account.objects.create(name="Bank", type=models.Account.AccountType.ASSET_ACCOUNT, currency="EUR")
+        cls.shop = models.Account.objects.create(name="Shop", type=models.Account.AccountType.EXPENSE_ACCOUNT, currency="EUR")
+        cls.cafe = models.Account.objects.create(name="Cafe", type=models.Account.AccountType.EXPENSE_ACCOUNT, currency="EUR")
+
+        for day, account in enumerate([cls.shop, cls.cafe], start=1):
+            models.TransactionJournal.create(
+                {
+                    "short_description": "Journal {day}".format(day=day),
+                    "date": date(2021, 1, day),
+                    "type": models.TransactionJournal.TransactionType.WITHDRAWAL,
+                    "transactions": [{"account": cls.bank, "amount": Money(-10, "EUR")}, {"account": account, "amount": Money(10, "EUR")}],
+                }
+            )
+
+    def test_delete_keeps_other_legs(self):
+        # A leg left without account elsewhere in the ledger is not part of this deletion
+        orphan = models.Transaction.objects.get(account=self.cafe)
+        models.Transaction.objects.filter(pk=orphan.pk).update(account=None)
+
+        self.client.force_login(self.user)
+        self.client.post(reverse("blackbook:accounts_delete"), {"account_uuid": self.shop.uuid})
+
+        self.assertFalse(models.Account.objects.filter(pk=self.shop.pk).exists())
+        self.assertTrue(models.Transaction.objects.filter(pk=orphan.pk).exists())
+        self.assertEqual(sorted(models.TransactionJournal.objects.values_list("short_description", flat=True)), ["Journal 1", "Journal 2"])
+        self.assertEqual(models.Transaction.objects.filter(journal__short_description="Journal 1").count(), 1)
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.db.models import Max, Min
+
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+from .models import Account, Transaction, TransactionJournal
+
+
+def find_transfer_pairs(transaction_journals, journal_ids=None, days=None):
+    """Returns ``(withdrawal id, deposit id)`` pairs of journals in ``transaction_journals`` that are most likely the two
+    halves of one transfer: the withdrawal takes an amount out of one owned account (asset or liability) and the deposit puts
+    the same amount, in the same currency, into another owned account at most ``days`` days apart.
+
+    This is a hash join: the owned legs of the withdrawals are hashed on (currency, amount) and kept sorted by date, every
+    deposit then probes its bucket for the closest unpaired withdrawal within the date window (by bisection). Each journal is
+    paired at most once. With ``journal_ids`` only pairs with at least one of these journals are returned, and only journals
+    within ``days`` of their dates are read."""
+    days = days if days is not None else getattr(settings, "BLACKBOOK_TRANSFER_DAYS", 3)
+    journal_ids = set(journal_ids) if journal_ids is not None else None
+
+    legs = Transaction.objects.filter(
+        journal__in=transaction_journals,
+        journal__type__in=[TransactionJournal.TransactionType.WITHDRAWAL, TransactionJournal.TransactionType.DEPOSIT],
+        account__type__in=[Account.AccountType.ASSET_ACCOUNT, Account.AccountType.LIABILITIES_ACCOUNT],
+    )
+
+    if journal_ids is not None:
+        if len(journal_ids) == 0:
+            return []
+
+        dates = TransactionJournal.objects.filter(id__in=journal_ids).aggregate(start_date=Min("date"), end_date=Max("date"))
+        legs = legs.filter(date__gte=dates["start_date"] - timedelta(days=days), date__lte=dates["end_date"] + timedelta(days=days))
+
+    owned_legs = {}
+    for journal_id, journal_type, account_id, amount, currency, date in legs.values_list(
+        "journal_id", "journal__type", "account_id", "amount", "amount_currency", "date"
+    ).iterator():
+        owned_legs.setdefault(journal_id, []).append((journal_type, account_id, amount, currency, date))
+
+    withdrawals = {}
+    deposits = []
+    for journal_id, journal_legs in owned_legs.items():
+        # Journals moving money between several owned accounts are no halves of a single transfer
+        if len(journal_legs) != 1:
+            continue
+
+        journal_type, account_id, amount, currency, date = journal_legs[0]
+        if journal_type == TransactionJournal.TransactionType.WITHDRAWAL and amount < 0:
+            withdrawals.setdefault((currency, -amount), []).append((date, journal_id, account_id))
+        elif journal_type == TransactionJournal.TransactionType.DEPOSIT and amount > 0:
+            deposits.append((date, journal_id, account_id, (currency, amount)))
+
+    for bucket in withdrawals.values():
+        bucket.sort()
+
+    pairs = []
+    paired = set()
+    for date, journal_id, account_id, key in sorted(deposits):
+        bucket = withdrawals.get(key, [])
+        start = bisect_left(bucket, (date - timedelta(days=days),))
+        end = bisect_right(bucket, (date + timedelta(days=days + 1),))
+
+        candidates = [
+            (abs((withdrawal_date - date).days), withdrawal_id)
+            for withdrawal_date, withdrawal_id, withdrawal_account_id in bucket[start:end]
+            if withdrawal_account_id != account_id
+            and withdrawal_id not in paired
+            and (journal_ids is None or journal_id in journal_ids or withdrawal_id in journal_ids)
+        ]
+
+        if len(candidates) > 0:
+            withdrawal_id = min(candidates)[1]
+            pairs.append((withdrawal_id, journal_id))
+            paired.add(withdrawal_id)
+
+    return pairs
+
+
+def pair_transfers(transaction_journals, journal_ids=None, days=None, update_snapshots=True, from_dates=None):
+    """Finds the transfer pairs (see ``find_transfer_pairs``) and merges them with ``TransactionJournal.merge_transfers``,
+    returns the transfer journals."""
+    pairs = find_transfer_pairs(transaction_journals, journal_ids=journal_ids, days=days)
+
+    return TransactionJournal.merge_transfers(pairs, update_snapshots=update_snapshots, from_dates=from_dates)
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import dashboard, profile, accounts, transactions, categories, budgets
+from .views import dashboard, profile, accounts, transactions, categories, budgets, duplicates, autocomplete
 
 app_name = "blackbook"
 urlpatterns = [
@@ -21,6 +21,13 @@ urlpatterns = [
     path("transactions/add/", transactions.add_edit, name="transactions_add"),
     path("transactions/edit/<str:transaction_uuid>/", transactions.add_edit, name="transactions_edit"),
     path("transactions/delete/", transactions.delete, name="transactions_delete"),
+    path("transactions/export/", transactions.export, name="transactions_export"),
+    path("transactions/bulk-edit/", transactions.bulk_edit, name="transactions_bulk_edit"),
+    #
+    #
+    # Duplicates
+    path("duplicates/", duplicates.duplicates, name="duplicates"),
+    path("duplicates/resolve/", duplicates.resolve, name="duplicates_resolve"),
     #
     #
     # Categories
@@ -35,4 +42,10 @@ urlpatterns = [
     path("budgets/add/", budgets.budgets, name="budgets_add"),
     path("budgets/edit/", budgets.budgets, name="budgets_edit"),
     path("budgets/delete/", budgets.delete, name="budgets_delete"),
+    #
+    #
+    # Autocomplete
+    path("autocomplete/accounts/", autocomplete.accounts, name="autocomplete_accounts"),
+    path("autocomplete/categories/", autocomplete.categories, name="autocomplete_categories"),
+    path("autocomplete/budgets/", autocomplete.budgets, name="autocomplete_budgets"),
 ]
@@ -3,12 +3,17 @@ from django.utils.html import format_html
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.template.defaultfilters import slugify
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db.models import Subquery
+from django.views.decorators.http import condition
 
 from dateutil.relativedelta import relativedelta, MO
 from datetime import datetime, date
 from babel.numbers import get_currency_name
 from babel import Locale
 
+import hashlib
 import re
 
 
@@ -52,6 +57,42 @@ def set_message_and_redirect(request, message, url):
     return redirect(url)
 
 
+def get_ledger_etag(request, *args, **kwargs):
+    """Returns an ETag for a read view over the ledger, built from the latest modification of the ledger models and the
+    user profile (read in one query), the "dashboard" generation (bumped on every save and delete) and everything else
+    the page depends on. No ETag is returned while messages are waiting to be displayed, nor without a cache shared by
+    all processes."""
+    from .models import UserProfile, Account, Budget, BudgetPeriod, Category, TransactionJournal, Transaction
+    from .cache import get_generation, is_shared_cache
+
+    # A generation only this process sees would hide changes made by other workers
+    if len(get_messages(request)) > 0 or not is_shared_cache():
+        return None
+
+    models = [Account, Budget, BudgetPeriod, Category, TransactionJournal, Transaction]
+    last_modified = (
+        UserProfile.objects.filter(user=request.user)
+        .annotate(**{model.__name__.lower(): Subquery(model.objects.order_by("-modified").values("modified")[:1]) for model in models})
+        .values_list("modified", *[model.__name__.lower() for model in models])
+        .first()
+    )
+
+    validator = [
+        request.user.pk,
+        request.path,
+        request.GET.urlencode(),
+        timezone.localdate(),
+        get_generation("dashboard"),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        last_modified,
+    ]
+
+    return hashlib.sha1(repr(validator).encode()).hexdigest()
+
+
+conditional_view = condition(etag_func=get_ledger_etag)
+
+
 def calculate_period(periodicity, start_date=timezone.localtime(), as_tuple=False):
     if type(start_date) == datetime:
         start_date = start_date.date()
@@ -129,6 +170,21 @@ def format_iban(value, grouping=4):
     return " ".join(value[i : i + grouping] for i in range(0, len(value), grouping))
 
 
+def get_fingerprint(date, short_description, legs, occurrence=0):
+    """Returns the sha256 hash identifying a journal by its date, short description (ignoring case and spacing) and legs,
+    given as (account id, amount, currency) tuples. ``occurrence`` tells identical rows of one imported statement apart."""
+    legs = sorted(
+        "{account}:{amount:.2f}:{currency}".format(account=account, amount=amount, currency=str(currency).upper())
+        for account, amount, currency in legs
+    )
+    parts = [date.isoformat(), " ".join(short_description.split()).casefold(), ",".join(legs)]
+
+    if occurrence > 0:
+        parts.append(str(occurrence))
+
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
 def validate_iban(iban):
     _country2length = dict(
         AL=28,
@@ -1,6 +1,7 @@
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse
+from django.db import transaction as db_transaction
 from django.db.models import Sum, Prefetch, Count
 from django.db.models.functions import Coalesce
 from django.utils import timezone
@@ -9,40 +10,36 @@ from djmoney.money import Money
 from decimal import Decimal
 
 from ..models import get_default_value, Account, Transaction, TransactionJournal
-from ..utilities import set_message_and_redirect, calculate_period
+from ..utilities import set_message_and_redirect, calculate_period, conditional_view
 from ..forms import AccountForm
-from ..charts import AccountChart, TransactionChart
+from ..charts import AccountChart, ChartBundle
 
 
 @login_required
+@conditional_view
 def accounts(request, account_type=None, account_slug=None):
     if account_slug is not None:
         period = get_default_value(key="default_period", default_value="month", user=request.user)
         period = calculate_period(periodicity=period, start_date=timezone.localdate())
 
-        account = get_object_or_404(Account, slug=account_slug)
+        account = get_object_or_404(Account.objects.with_balances(as_of=timezone.localdate()), slug=account_slug)
         transactions = (
             Transaction.objects.filter(account=account)
-            .filter(journal__date__range=(period["start_date"], period["end_date"]))
+            .filter(date__range=(period["start_date"], period["end_date"]))
             .select_related("journal", "account")
-            .order_by("-journal__date")
+            .order_by("-date")
         )
 
         period_in = Money(transactions.filter(amount__gte=0).aggregate(total=Coalesce(Sum("amount"), Decimal(0)))["total"], account.currency)
         period_out = Money(transactions.filter(amount__lte=0).aggregate(total=Coalesce(Sum("amount"), Decimal(0)))["total"], account.currency)
         period_balance = period_in + period_out
-        account.total = account.balance_until_date()
+        account.total = Money(account.adjusted_balance, account.currency)
 
         charts = {
             "account_chart": AccountChart(
                 data=transactions, accounts=[account], start_date=period["start_date"], end_date=period["end_date"], user=request.user
             ).generate_json(),
-            "income_chart": TransactionChart(data=transactions, user=request.user, income=True).generate_json(),
-            "income_chart_count": len([item for item in transactions if not item.amount.amount < 0]),
-            "expense_budget_chart": TransactionChart(data=transactions, expenses_budget=True, user=request.user).generate_json(),
-            "expense_budget_chart_count": len([item for item in transactions if item.amount.amount < 0 and item.journal.budget is not None]),
-            "expense_category_chart": TransactionChart(data=transactions, expenses_category=True, user=request.user).generate_json(),
-            "expense_category_chart_count": len([item for item in transactions if item.amount.amount < 0 and item.journal.category is not None]),
+            **ChartBundle(data=transactions, user=request.user).generate_charts(),
         }
 
         return render(
@@ -68,18 +65,12 @@ def accounts(request, account_type=None, account_slug=None):
             "cashaccount": {"name": "cash accounts", "icon": "fa-coins", "total": {}},
         }
 
-        accounts = (
-            Account.objects.filter(type=account_type)
-            .annotate(
-                total=Coalesce(Sum("transactions__amount"), Decimal(0)),
-            )
-            .order_by("name")
-        )
+        accounts = Account.objects.filter(type=account_type).with_balances().order_by("name")
 
         account_type = account_types[account_type]
 
         for account in accounts:
-            account.total_amount = Money(account.total, account.currency) - Money(account.virtual_balance, account.currency)
+            account.total_amount = Money(account.adjusted_balance, account.currency)
             account_type["total"][account.currency] = account_type["total"].get(account.currency, Money(0, account.currency)) + account.total_amount
 
         return render(request, "blackbook/accounts/list.html", {"account_type": account_type, "accounts": accounts})
@@ -90,7 +81,7 @@ def add_edit_account(request, account_slug=None):
     account = Account()
 
     if account_slug is not None:
-        account = get_object_or_404(Account, slug=account_slug)
+        account = get_object_or_404(Account.objects.with_balances(as_of=timezone.localdate()), slug=account_slug)
 
     account_form = AccountForm(request.POST or None, instance=account, initial={"starting_balance": account.starting_balance.amount})
 
@@ -102,7 +93,7 @@ def add_edit_account(request, account_slug=None):
 
             try:
                 opening_balance_transaction = account.transactions.filter(journal__type=TransactionJournal.TransactionType.START).get(
-                    journal__date=account.created.date()
+                    date=account.created.date()
                 )
 
                 if opening_balance_transaction.amount != opening_balance:
@@ -134,13 +125,23 @@ def add_edit_account(request, account_slug=None):
 @login_required
 def delete(request):
     if request.method == "POST":
-        account = Account.objects.get(uuid=request.POST.get("account_uuid"))
-        account.delete()
-
-        hanging_transactions = Transaction.objects.filter(source_account=None, destination_account=None)
-        hanging_transactions.delete()
-        hanging_journals = TransactionJournal.objects.filter(transactions=None)
-        hanging_journals.delete()
+        with db_transaction.atomic():
+            account = Account.objects.get(uuid=request.POST.get("account_uuid"))
+            leg_ids = list(account.transactions.order_by("id").values_list("id", flat=True))
+            journal_ids = list(account.transactions.order_by("journal_id").values_list("journal_id", flat=True).distinct())
+            account.delete()
+
+            # Legs of the account are kept (the foreign key is set to NULL), remove them and the journals left without legs
+            for start in range(0, len(leg_ids), 500):
+                hanging_transactions = Transaction.objects.filter(id__in=leg_ids[start : start + 500])
+                hanging_transactions.delete()
+
+            for start in range(0, len(journal_ids), 500):
+                hanging_journals = TransactionJournal.objects.filter(id__in=journal_ids[start : start + 500], transactions=None)
+                hanging_journals.delete()
+
+            for journal in TransactionJournal.objects.filter(id__in=journal_ids):
+                journal.update_accounts()
 
         return set_message_and_redirect(
             request,
@@ -0,0 +1,67 @@
+from django.contrib.auth.decorators import login_required
+from django.db import connections
+from django.db.models.functions import Upper
+from django.http import JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET
+
+from ..models import Category, Budget
+from ..registry import get_account_registry
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def _get_query(request):
+    try:
+        limit = min(max(int(request.GET.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        limit = DEFAULT_LIMIT
+
+    return request.GET.get("q", "").strip(), limit
+
+
+def _filter_names(queryset, query):
+    """Filters on names starting with ``query`` (ignoring case) through the index on ``UPPER(name)``: a LIKE prefix match
+    on PostgreSQL (text_pattern_ops index), a range on SQLite where the case-insensitive LIKE cannot use the index."""
+    if query == "":
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    # SQLite's UPPER only changes ASCII letters
+    prefix = "".join(character.upper() if vendor != "sqlite" or character.isascii() else character for character in query)
+    queryset = queryset.annotate(upper_name=Upper("name")).filter(upper_name__startswith=prefix)
+
+    if vendor == "sqlite":
+        queryset = queryset.filter(upper_name__gte=prefix, upper_name__lt=prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+    return queryset
+
+
+@login_required
+@require_GET
+@cache_control(private=True, max_age=60)
+def accounts(request):
+    query, limit = _get_query(request)
+
+    return JsonResponse({"results": get_account_registry().search(query, limit=limit)})
+
+
+@login_required
+@require_GET
+@cache_control(private=True, max_age=60)
+def categories(request):
+    query, limit = _get_query(request)
+
+    return JsonResponse({"results": list(_filter_names(Category.objects.all(), query).order_by("name").values_list("name", flat=True)[:limit])})
+
+
+@login_required
+@require_GET
+@cache_control(private=True, max_age=60)
+def budgets(request):
+    query, limit = _get_query(request)
+
+    return JsonResponse(
+        {"results": list(_filter_names(Budget.objects.filter(active=True), query).order_by("name").values_list("name", flat=True)[:limit])}
+    )
@@ -4,10 +4,11 @@ from django.urls import reverse
 
 from ..forms import BudgetForm
 from ..models import Budget
-from ..utilities import set_message_and_redirect
+from ..utilities import set_message_and_redirect, conditional_view
 
 
 @login_required
+@conditional_view
 def budgets(request):
     budgets = Budget.objects.all()
 
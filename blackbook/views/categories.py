@@ -4,10 +4,11 @@ from django.urls import reverse
 
 from ..forms import CategoryForm
 from ..models import Category
-from ..utilities import set_message_and_redirect
+from ..utilities import set_message_and_redirect, conditional_view
 
 
 @login_required
+@conditional_view
 def categories(request):
     categories = Category.objects.all()
 
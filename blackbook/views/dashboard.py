@@ -6,26 +6,33 @@ from django.utils import timezone
 
 from djmoney.money import Money
 from decimal import Decimal
-from datetime import timedelta
 
-from ..models import get_default_value, get_default_currency, TransactionJournal, Transaction, Account, BudgetPeriod
-from ..utilities import calculate_period, display_period
-from ..charts import AccountChart
+from ..models import get_default_value, get_default_currency, TransactionJournal, Transaction, Account, BudgetPeriod, NetWorthSnapshot
+from ..utilities import calculate_period, display_period, conditional_view
+from ..charts import AccountChart, NetWorthChart
+from ..cache import get_or_set
 
 
 @login_required
+@conditional_view
 def dashboard(request):
-    period = get_default_value(key="default_period", default_value="month", user=request.user)
-    currency = get_default_currency(user=request.user)
+    data = get_or_set("dashboard", [request.user.pk, timezone.localdate()], lambda: _get_dashboard_data(user=request.user))
+
+    return render(request, "blackbook/dashboard.html", {"data": data})
+
+
+def _get_dashboard_data(user):
+    period = get_default_value(key="default_period", default_value="month", user=user)
+    currency = get_default_currency(user=user)
 
     net_worth_transactions = (
         Transaction.objects.filter(account__active=True)
         .filter(account__net_worth=True)
-        .filter(journal__date__range=calculate_period(periodicity=period, start_date=timezone.localdate(), as_tuple=True))
+        .filter(date__range=calculate_period(periodicity=period, start_date=timezone.localdate(), as_tuple=True))
         .filter(amount_currency=currency)
         .select_related("journal")
         .select_related("account")
-        .order_by("journal__date")
+        .order_by("date")
     )
 
     budgets = (
@@ -36,7 +43,8 @@ def dashboard(request):
         .aggregate(total=Coalesce(Sum("amount"), Decimal(0)), used=Coalesce(Sum("transactions__amount"), Decimal(0)))
     )
 
-    accounts = Account.objects.filter(active=True).filter(net_worth=True).filter(dashboard=True).prefetch_related("transactions")
+    accounts = Account.objects.filter(active=True).filter(net_worth=True).filter(dashboard=True)
+    net_worth_snapshots = NetWorthSnapshot.objects.filter(net_worth_currency=currency)
 
     data = {
         "totals": {
@@ -45,13 +53,7 @@ def dashboard(request):
                 "out": Money(0, currency),
                 "total": Money(0, currency),
             },
-            "net_worth": Money(
-                Transaction.objects.filter(account__active=True)
-                .filter(account__net_worth=True)
-                .filter(amount_currency=currency)
-                .aggregate(total=Coalesce(Sum("amount"), Decimal(0)))["total"],
-                currency,
-            ),
+            "net_worth": NetWorthSnapshot.get_net_worth(currency=currency, date=timezone.localdate()),
         },
         "budget": {
             "total": Money(budgets["total"], currency),
@@ -66,8 +68,14 @@ def dashboard(request):
                 accounts=accounts,
                 start_date=calculate_period(periodicity=period, start_date=timezone.localdate())["start_date"],
                 end_date=calculate_period(periodicity=period, start_date=timezone.localdate())["end_date"],
-                user=request.user,
-            ).generate_json()
+                user=user,
+            ).generate_json(),
+            "net_worth_chart": NetWorthChart(
+                data=net_worth_snapshots,
+                start_date=net_worth_snapshots.values_list("date", flat=True).first() or timezone.localdate(),
+                end_date=timezone.localdate(),
+                user=user,
+            ).generate_json(),
         },
     }
 
@@ -87,13 +95,4 @@ def dashboard(request):
         ).days
     )
 
-    start_date = calculate_period(periodicity=period, start_date=timezone.localdate())["start_date"] - timedelta(days=1)
-    total_virtual_balance = Money(0, currency)
-    for account in accounts:
-        if account.currency == currency:
-            data["totals"]["net_worth"] += account.balance_until_date(date=start_date)
-            total_virtual_balance += Money(account.virtual_balance, currency)
-
-    data["totals"]["net_worth"] -= total_virtual_balance
-
-    return render(request, "blackbook/dashboard.html", {"data": data})
\ No newline at end of file
+    return data
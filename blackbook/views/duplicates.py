@@ -0,0 +1,45 @@
+from django.shortcuts import render, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.urls import reverse
+from django.db import transaction as db_transaction
+
+from ..models import DuplicateCandidate
+from ..utilities import set_message_and_redirect
+from ..concurrency import lock_accounts
+
+
+@login_required
+def duplicates(request):
+    candidates = DuplicateCandidate.objects.filter(dismissed=False).select_related("journal", "journal__category", "duplicate", "duplicate__category")
+
+    return render(request, "blackbook/duplicates/list.html", {"candidates": candidates[:100], "count": candidates.count()})
+
+
+@login_required
+def resolve(request):
+    if request.method != "POST":
+        return set_message_and_redirect(request, "w|You are not allowed to access this page like this.", reverse("blackbook:duplicates"))
+
+    candidate = get_object_or_404(DuplicateCandidate.objects.select_related("journal", "duplicate"), uuid=request.POST.get("candidate_uuid"))
+
+    if request.POST.get("action") == "dismiss":
+        candidate.dismissed = True
+        candidate.save()
+
+        return set_message_and_redirect(
+            request, 's|Transactions "{candidate}" were marked as not duplicate.'.format(candidate=candidate), reverse("blackbook:duplicates")
+        )
+
+    journal_entry = {str(journal.uuid): journal for journal in [candidate.journal, candidate.duplicate]}.get(request.POST.get("transaction_uuid"))
+    if journal_entry is None:
+        return set_message_and_redirect(request, "w|Please choose which transaction to delete.", reverse("blackbook:duplicates"))
+
+    with db_transaction.atomic():
+        lock_accounts([], journal=journal_entry)
+        journal_entry.delete()
+
+    return set_message_and_redirect(
+        request,
+        's|Transaction "{journal_entry.short_description}" was succesfully deleted.'.format(journal_entry=journal_entry),
+        reverse("blackbook:duplicates"),
+    )
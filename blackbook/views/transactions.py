@@ -1,25 +1,29 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse
-from django.db.models import Sum, Q
-from django.db.models.functions import Coalesce
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.db import transaction as db_transaction
+from django.db.models import Q
 from django.utils import timezone
+from django.utils.http import urlencode
 
 from djmoney.money import Money
-from decimal import Decimal
 
 from ..models import Transaction, TransactionJournal, Account, Category, Budget, get_default_currency, get_default_value
-from ..utilities import set_message_and_redirect, calculate_period, set_message
-from ..charts import TransactionChart
-from ..forms import TransactionForm, TransactionFilterForm
+from ..utilities import set_message_and_redirect, calculate_period, set_message, conditional_view
+from ..charts import ChartBundle
+from ..forms import TransactionForm, TransactionFilterForm, TransactionBulkEditForm
+from ..export import get_export_rows, EXPORT_FORMATS
+from ..registry import get_account_registry, parse_account_label
+from ..concurrency import lock_accounts
 
 import datetime
-import re
-
-ACCOUNT_REGEX = re.compile(r"(.*)\s-\s(.*)")
+import uuid
 
 
 @login_required
+@conditional_view
 def transactions(request):
     transaction_journals = TransactionJournal.objects.all()
 
@@ -31,57 +35,102 @@ def transactions(request):
         period["start_date"] = filter_form.cleaned_data["start_date"]
         period["end_date"] = filter_form.cleaned_data["end_date"]
 
-        if filter_form.cleaned_data["description"] != "":
-            transaction_journals = transaction_journals.filter(
-                Q(short_description__icontains=filter_form.cleaned_data["description"])
-                | Q(description__icontains=filter_form.cleaned_data["description"])
-            )
+        try:
+            transaction_journals = filter_form.filter(transaction_journals)
+        except Account.DoesNotExist as error:
+            filter_form.add_error("account", str(error))
+            transaction_journals = TransactionJournal.objects.none()
 
-        if filter_form.cleaned_data["account"] != "":
-            account_type = Account.AccountType.REVENUE_ACCOUNT
-            account_name = filter_form.cleaned_data["account"]
+    transaction_journals = transaction_journals.filter(date__range=(period["start_date"], period["end_date"]))
+    transactions = Transaction.objects.filter(journal__in=transaction_journals)
 
-            for type in Account.AccountType:
-                if type.label == ACCOUNT_REGEX.match(account_name)[1]:
-                    account_type = type
+    page_size = _get_page_size(request)
+    cursor = _decode_cursor(request.GET.get("after", None))
 
-            if ACCOUNT_REGEX.match(account_name) is not None:
-                account_name = ACCOUNT_REGEX.match(account_name)[2]
+    page = transaction_journals.select_related("category", "budget__budget").order_by("-date", "-created", "-id")
+    if cursor is not None:
+        page = page.filter(Q(date__lt=cursor[0]) | Q(date=cursor[0], created__lt=cursor[1]) | Q(date=cursor[0], created=cursor[1], id__lt=cursor[2]))
 
-            account = Account.objects.get(name=account_name, type=account_type)
-            transaction_journals = transaction_journals.filter(transactions__account=account)
+    page = list(page[: page_size + 1])
+    next_page = None
 
-        if filter_form.cleaned_data["category"] != "":
-            transaction_journals = transaction_journals.filter(category__name__icontains=filter_form.cleaned_data["category"])
+    if len(page) > page_size:
+        page = page[:page_size]
 
-        if filter_form.cleaned_data["budget"] != "":
-            transaction_journals = transaction_journals.filter(budget__budget__name__icontains=filter_form.cleaned_data["budget"])
+        next_page = request.GET.copy()
+        next_page["after"] = _encode_cursor(page[-1])
+        next_page = next_page.urlencode()
 
-    transaction_journals = (
-        transaction_journals.filter(date__range=(period["start_date"], period["end_date"]))
-        .prefetch_related("transactions")
-        .select_related("category")
-        .order_by("-date")
-    )
-    transactions = Transaction.objects.filter(journal__in=transaction_journals).annotate(total=Coalesce(Sum("amount"), Decimal(0)))
-
-    charts = {
-        "income_chart": TransactionChart(
-            data=transactions.exclude(journal__type=TransactionJournal.TransactionType.TRANSFER), user=request.user, income=True
-        ).generate_json(),
-        "income_chart_count": len([item for item in transactions if not item.amount.amount < 0]),
-        "expense_budget_chart": TransactionChart(data=transactions, expenses_budget=True, user=request.user).generate_json(),
-        "expense_budget_chart_count": len([item for item in transactions if item.amount.amount < 0 and item.journal.budget is not None]),
-        "expense_category_chart": TransactionChart(data=transactions, expenses_category=True, user=request.user).generate_json(),
-        "expense_category_chart_count": len([item for item in transactions if item.amount.amount < 0 and item.journal.category is not None]),
-    }
+    charts = {}
+    if cursor is None:
+        charts = ChartBundle(data=transactions, user=request.user, income_transfers=False).generate_charts()
 
     return render(
         request,
         "blackbook/transactions/list.html",
-        {"filter_form": filter_form, "charts": charts, "period": period, "transaction_journals": transaction_journals},
+        {
+            "filter_form": filter_form,
+            "bulk_edit_form": TransactionBulkEditForm(prefix="edit"),
+            "charts": charts,
+            "period": period,
+            "transaction_journals": page,
+            "next_page": next_page,
+            "is_first_page": cursor is None,
+        },
+    )
+
+
+def _get_page_size(request):
+    page_size = getattr(settings, "BLACKBOOK_TRANSACTIONS_PAGE_SIZE", 50)
+
+    try:
+        page_size = int(request.GET.get("page_size", page_size))
+    except ValueError:
+        pass
+
+    return min(max(page_size, 1), 500)
+
+
+def _encode_cursor(transaction_journal):
+    return "{date}_{created}_{id}".format(
+        date=transaction_journal.date.isoformat(), created=transaction_journal.created.isoformat(), id=transaction_journal.id
+    )
+
+
+def _decode_cursor(cursor):
+    """Returns the (date, created, id) tuple of the last journal on the previous page, or None for the first page."""
+    if cursor is None:
+        return None
+
+    try:
+        date, created, id = cursor.split("_")
+
+        return (datetime.date.fromisoformat(date), datetime.datetime.fromisoformat(created), int(id))
+    except ValueError:
+        return None
+
+
+@login_required
+def export(request):
+    transaction_journals = TransactionJournal.objects.all()
+    export_format = EXPORT_FORMATS.get(request.GET.get("format", "csv"), EXPORT_FORMATS["csv"])
+
+    filter_form = TransactionFilterForm(request.GET or None)
+    if filter_form.is_valid():
+        try:
+            transaction_journals = filter_form.filter(transaction_journals, filter_dates=True)
+        except Account.DoesNotExist as error:
+            return set_message_and_redirect(
+                request, "w|{error}".format(error=error), "{url}?{query}".format(url=reverse("blackbook:transactions"), query=request.GET.urlencode())
+            )
+
+    response = StreamingHttpResponse(export_format["stream"](get_export_rows(transaction_journals)), content_type=export_format["content_type"])
+    response["Content-Disposition"] = 'attachment; filename="transactions-{date}.{extension}"'.format(
+        date=timezone.localdate().isoformat(), extension=export_format["extension"]
     )
 
+    return response
+
 
 @login_required
 def add_edit(request, transaction_uuid=None):
@@ -135,21 +184,27 @@ def add_edit(request, transaction_uuid=None):
             "transactions": [],
         }
 
-        for account_type_key in ["source_account", "destination_account"]:
-            if transaction_form.cleaned_data[account_type_key] != "":
-                account_name = transaction_form.cleaned_data[account_type_key]
-
-                account_type = Account.AccountType.REVENUE_ACCOUNT
-                if account_type_key == "destination_account":
-                    account_type = Account.AccountType.EXPENSE_ACCOUNT
+        account_labels = {
+            account_type_key: (transaction_form.cleaned_data[account_type_key], default_type)
+            for account_type_key, default_type in [
+                ("source_account", Account.AccountType.REVENUE_ACCOUNT),
+                ("destination_account", Account.AccountType.EXPENSE_ACCOUNT),
+            ]
+            if transaction_form.cleaned_data[account_type_key] != ""
+        }
 
-                if ACCOUNT_REGEX.match(transaction_form.cleaned_data[account_type_key]) is not None:
-                    account_name = ACCOUNT_REGEX.match(transaction_form.cleaned_data[account_type_key])[2]
+        registry = get_account_registry()
+        entries = {
+            account_type_key: registry.get(label, default_type=default_type) for account_type_key, (label, default_type) in account_labels.items()
+        }
+        accounts = Account.objects.in_bulk([entry.id for entry in entries.values() if entry is not None])
 
-                    for type in Account.AccountType:
-                        if type.label == ACCOUNT_REGEX.match(transaction_form.cleaned_data[account_type_key])[1]:
-                            account_type = type
+        for account_type_key, (label, default_type) in account_labels.items():
+            if entries[account_type_key] is not None and entries[account_type_key].id in accounts:
+                account = accounts[entries[account_type_key].id]
 
+            else:
+                account_type, account_name = parse_account_label(label, default_type=default_type)
                 account, account_created = Account.objects.get_or_create(
                     name=account_name, type=account_type, defaults={"type": account_type, "net_worth": False, "dashboard": False}
                 )
@@ -157,11 +212,11 @@ def add_edit(request, transaction_uuid=None):
                 if account_created:
                     set_message(request, 's|Account "{account.name}" was saved succesfully.'.format(account=account))
 
-                amount = transaction_form.cleaned_data["amount"]
-                if account_type_key == "source_account":
-                    amount *= -1
+            amount = transaction_form.cleaned_data["amount"]
+            if account_type_key == "source_account":
+                amount *= -1
 
-                transaction["transactions"].append({"account": account, "amount": amount})
+            transaction["transactions"].append({"account": account, "amount": amount})
 
         if transaction_form.cleaned_data["category"] != "":
             category, created = Category.objects.get_or_create(name=transaction_form.cleaned_data["category"])
@@ -202,7 +257,10 @@ def add_edit(request, transaction_uuid=None):
 def delete(request):
     if request.method == "POST":
         journal_entry = TransactionJournal.objects.get(uuid=request.POST.get("transaction_uuid"))
-        journal_entry.delete()
+
+        with db_transaction.atomic():
+            lock_accounts([], journal=journal_entry)
+            journal_entry.delete()
 
         return set_message_and_redirect(
             request,
@@ -211,3 +269,40 @@ def delete(request):
         )
     else:
         return set_message_and_redirect(request, "w|You are not allowed to access this page like this.", reverse("blackbook:dashboard"))
+
+
+@login_required
+def bulk_edit(request):
+    if request.method != "POST":
+        return set_message_and_redirect(request, "w|You are not allowed to access this page like this.", reverse("blackbook:transactions"))
+
+    filter_form = TransactionFilterForm(request.POST)
+    bulk_edit_form = TransactionBulkEditForm(request.POST, prefix="edit")
+    return_url = "{url}?{query}".format(
+        url=reverse("blackbook:transactions"), query=urlencode({key: request.POST.get(key, "") for key in filter_form.fields.keys()})
+    )
+
+    if not bulk_edit_form.is_valid():
+        errors = [error for field_errors in bulk_edit_form.errors.values() for error in field_errors]
+        return set_message_and_redirect(request, "w|{errors}".format(errors=" ".join(errors)), return_url)
+
+    try:
+        transaction_uuids = [uuid.UUID(transaction_uuid) for transaction_uuid in request.POST.getlist("transaction_uuids")]
+    except ValueError:
+        return set_message_and_redirect(request, "w|Invalid transaction selection.", return_url)
+
+    if len(transaction_uuids) > 0:
+        transaction_journals = TransactionJournal.objects.filter(uuid__in=transaction_uuids)
+
+    elif filter_form.is_valid() and any(value not in ["", None] for value in filter_form.cleaned_data.values()):
+        try:
+            transaction_journals = filter_form.filter(TransactionJournal.objects.all(), filter_dates=True)
+        except Account.DoesNotExist as error:
+            return set_message_and_redirect(request, "w|{error}".format(error=error), return_url)
+
+    else:
+        return set_message_and_redirect(request, "w|Select transactions or filter them before editing them in bulk.", return_url)
+
+    count = TransactionJournal.bulk_edit(transaction_journals, bulk_edit_form.get_changes())
+
+    return set_message_and_redirect(request, "s|{count} transactions were updated succesfully.".format(count=count), return_url)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/3.1/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -103,6 +104,20 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+# The cache invalidation counters have to be seen by every worker and import job, so the default is a file based cache
+# shared by all processes on this host. Use Redis or memcached when running on several hosts, a process local cache
+# (LocMemCache) disables the dashboard cache and the conditional GETs.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "django_blackbook_cache")),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
@@ -208,3 +223,28 @@ GRAPHENE = {
         "graphql_jwt.middleware.JSONWebTokenMiddleware",
     ],
 }
+
+# Column mappings for the import_statement management command, see blackbook/management/commands/import_statement.py
+BLACKBOOK_IMPORT_PROFILES = {}
+
+# Number of journals shown per page on the transactions list (can be overridden with ?page_size=, up to 500)
+BLACKBOOK_TRANSACTIONS_PAGE_SIZE = 50
+
+# Dotted path to the search backend used for the transaction description filter, see blackbook/search.py (defaults to one
+# matching the database: an FTS5 table on SQLite, a tsvector column on PostgreSQL)
+BLACKBOOK_SEARCH_BACKEND = None
+
+# Attempts and backoff (in seconds, doubled after every attempt up to the maximum) for ledger writes failing on a deadlock,
+# serialization failure or lock timeout, see blackbook/concurrency.py
+BLACKBOOK_WRITE_RETRIES = 5
+BLACKBOOK_WRITE_BACKOFF = 0.05
+BLACKBOOK_WRITE_MAX_BACKOFF = 1.0
+
+# Maximum number of days between two transactions and minimum similarity (0 to 1) of their descriptions to be reported as
+# likely duplicates, see blackbook/duplicates.py
+BLACKBOOK_DUPLICATE_DAYS = 3
+BLACKBOOK_DUPLICATE_THRESHOLD = 0.6
+
+# Maximum number of days between a withdrawal and a deposit of the same amount on two owned accounts to be merged into one
+# transfer, see blackbook/transfers.py
+BLACKBOOK_TRANSFER_DAYS = 3